@@ -8,6 +8,23 @@ import pikepdf
 
 import pdfbeaver as beaver
 
+# Color handlers run once per color operator, so they are specialized by
+# arity (1 = gray, 3 = RGB) rather than looping over the operands.
+_INVERT = {
+    1: lambda o: (1.0 - float(o[0]),),
+    3: lambda o: (1.0 - float(o[0]), 1.0 - float(o[1]), 1.0 - float(o[2])),
+}
+
+
+def _invert_generic(operands):
+    return tuple(1.0 - float(x) for x in operands)
+
+
+# The constant parts of the background are written as raw bytes, which the
+# editor copies to the output without formatting them.
+_BACKGROUND_PROLOG = b"0 g"
+_BACKGROUND_EPILOG = b"f 1 g 1 G"
+
 
 def main():
     if len(sys.argv) < 3:
@@ -17,16 +34,16 @@ def main():
     registry = beaver.HandlerRegistry()
 
     @registry.register("^")
-    def background(operands, context):
+    def background(page):
         # Add black background
-        page = context.page
         box = page.mediabox
         rectangle_args = [box[0], box[1], abs(box[2] - box[0]), abs(box[3] - box[1])]
-        return [(0, "g"), (rectangle_args, "re"), ([], "f"), (1, "g"), (1, "G")]
+        return [_BACKGROUND_PROLOG, (rectangle_args, "re"), _BACKGROUND_EPILOG]
 
     @registry.register("RG", "rg", "G", "g")
     def invert_colors(operands, operator):
-        return ([1 - float(x) for x in operands], operator)
+        invert = _INVERT.get(len(operands), _invert_generic)
+        return (invert(operands), operator)
 
     with pikepdf.open(sys.argv[1]) as pdf:
         beaver.process(pdf, registry=registry)
@@ -1,12 +1,24 @@
 #!/usr/bin/env python
 import sys
 
+import numpy as np
 import pikepdf
 
 import pdfbeaver
 from pdfbeaver.utils import extract_text_position
 
 
+def _unparse_rects_bulk(rects: np.ndarray) -> bytes:
+    """Formats an (N, 4) array of rectangles as N ``re`` operators, in one pass.
+
+    Numbers are written as pikepdf writes reals (6 decimal places, trailing
+    zeros removed), so the output matches unparsing the operators one by one.
+    """
+    nums = [f"{v:.6f}".rstrip("0").rstrip(".") for v in rects.ravel().tolist()]
+    line = "%s %s %s %s re\n"
+    return ((line * len(rects)) % tuple(nums)).encode("latin1")
+
+
 def main():
     if len(sys.argv) < 3:
         print(
@@ -21,7 +33,9 @@ def main():
 
     # --- Local State & Registry ---
     registry = pdfbeaver.HandlerRegistry()
-    rects = []
+    # Rectangles found on the current page: the first `count` rows of `rects`
+    rects = np.empty((64, 4), dtype=np.float64)
+    count = 0
 
     def tj_offset(width, text_state):
         h_scale = text_state.scaling / 100.0
@@ -33,6 +47,7 @@ def main():
 
     @registry.register("Tj", "TJ")
     def redact_smart(operands, context):
+        nonlocal rects, count
         text_state = context.pre_input["tstate"]
 
         # Determine content string
@@ -42,17 +57,18 @@ def main():
         if target_word in content_str:
             start_pos = extract_text_position(context.pre_input)
             end_pos = extract_text_position(context.post_input)
-            width = abs(end_pos[0] - start_pos[0])
+            width = float(abs(end_pos[0] - start_pos[0]))
             print(f"Redacting: {operands}")
 
-            rects.append(
-                [
-                    start_pos[0],
-                    start_pos[1] - (text_state.fontsize * 0.2),
-                    width,
-                    text_state.fontsize * text_state.matrix[3],
-                ]
+            if count == len(rects):
+                rects = np.concatenate([rects, np.empty_like(rects)])
+            rects[count] = (
+                start_pos[0],
+                start_pos[1] - (text_state.fontsize * 0.2),
+                width,
+                text_state.fontsize * text_state.matrix[3],
             )
+            count += 1
 
             if not preview:
                 # Replace text with spacer
@@ -65,17 +81,15 @@ def main():
 
     @registry.register("$")
     def draw_rects(operands, context):
-        nonlocal rects
-        if not rects:
+        nonlocal count
+        if not count:
             return []
 
         cmds = [(0.5, "g")] if not preview else [(0.5, "G")]
         cmds.append(([1, 0, 0, 1, 0, 0], "cm"))
-        for r in rects:
-            cmds.append((r, "re"))
-
+        cmds.append(_unparse_rects_bulk(rects[:count]))
         cmds.append("f" if not preview else "s")
-        rects = []  # Clear for next page
+        count = 0  # Clear for next page (the array is reused)
         return cmds
 
     # Pass the local registry!
@@ -14,7 +14,12 @@ def main():
     with pikepdf.open(sys.argv[1]) as pdf:
         # Default registry is fine here since we want pass-through,
         # but explicit empty registry is safer for testing.
-        editor.process(pdf, registry=editor.HandlerRegistry())
+        # With no handlers and no optimizer, the pages are not even parsed.
+        editor.process(
+            pdf,
+            registry=editor.HandlerRegistry(),
+            options=editor.ProcessingOptions(optimize=False),
+        )
         pdf.save(sys.argv[2])
 
 
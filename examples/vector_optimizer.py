@@ -1,52 +1,123 @@
 #!/usr/bin/env python
 import math
 import sys
-from typing import List, Tuple
+from typing import Sequence, Tuple
 
+import numpy as np
 import pikepdf
 
 import pdfbeaver as editor
 
-# --- 1. The Math (Ramer-Douglas-Peucker) ---
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the NumPy version
+    njit = None
 
+# --- 1. The Math (Ramer-Douglas-Peucker) ---
 
-def perpendicular_distance(point, line_start, line_end):
-    """Calculates distance from point to the line segment."""
-    if line_start == line_end:
-        return math.hypot(point[0] - line_start[0], point[1] - line_start[1])
 
-    x, y = point
+def perpendicular_distances(
+    points: np.ndarray, line_start: np.ndarray, line_end: np.ndarray
+) -> np.ndarray:
+    """Calculates the distance from each point to the line through two points."""
     x1, y1 = line_start
     x2, y2 = line_end
+    xs, ys = points[:, 0], points[:, 1]
 
-    nom = abs((y2 - y1) * x - (x2 - x1) * y + x2 * y1 - y2 * x1)
-    denom = math.hypot(y2 - y1, x2 - x1)
-    return nom / denom
-
+    if x1 == x2 and y1 == y2:
+        return np.hypot(xs - x1, ys - y1)
 
-def simplify_path(
-    points: List[Tuple[float, float]], epsilon: float
-) -> List[Tuple[float, float]]:
-    """Recursively simplifies a list of (x,y) points."""
-    if len(points) < 3:
-        return points
+    nom = np.abs((y2 - y1) * xs - (x2 - x1) * ys + x2 * y1 - y2 * x1)
+    denom = np.hypot(y2 - y1, x2 - x1)
+    return nom / denom
 
-    dmax = 0.0
-    index = 0
-    end = len(points) - 1
 
-    for i in range(1, end):
-        d = perpendicular_distance(points[i], points[0], points[end])
-        if d > dmax:
-            index = i
-            dmax = d
+def _rdp_kernel(xs: np.ndarray, ys: np.ndarray, epsilon: float) -> np.ndarray:
+    """Scalar RDP over coordinate arrays, returning the indices to keep.
 
-    if dmax > epsilon:
-        rec_results1 = simplify_path(points[: index + 1], epsilon)
-        rec_results2 = simplify_path(points[index:], epsilon)
-        return rec_results1[:-1] + rec_results2
-    else:
-        return [points[0], points[end]]
+    Written in the subset of Python that numba can compile; it also runs
+    (slowly) as plain Python.
+    """
+    n = xs.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = True
+    keep[n - 1] = True
+
+    # Flat stack of (lo, hi) pairs; at most n - 1 disjoint segments are pending
+    stack = np.empty(2 * n, dtype=np.int64)
+    stack[0] = 0
+    stack[1] = n - 1
+    top = 2
+
+    while top > 0:
+        top -= 2
+        lo = stack[top]
+        hi = stack[top + 1]
+        if hi - lo < 2:
+            continue
+
+        x1, y1, x2, y2 = xs[lo], ys[lo], xs[hi], ys[hi]
+        denom = math.hypot(y2 - y1, x2 - x1)
+        dmax = -1.0
+        index = lo
+        for i in range(lo + 1, hi):
+            if denom == 0.0:
+                d = math.hypot(xs[i] - x1, ys[i] - y1)
+            else:
+                d = abs((y2 - y1) * xs[i] - (x2 - x1) * ys[i] + x2 * y1 - y2 * x1)
+                d /= denom
+            if d > dmax:
+                index = i
+                dmax = d
+
+        if dmax > epsilon:
+            keep[index] = True
+            stack[top] = lo
+            stack[top + 1] = index
+            stack[top + 2] = index
+            stack[top + 3] = hi
+            top += 4
+
+    return np.nonzero(keep)[0]
+
+
+_rdp_njit = njit(cache=True, fastmath=True)(_rdp_kernel) if njit else None
+
+
+def simplify_path(points: Sequence[Tuple[float, float]], epsilon: float) -> np.ndarray:
+    """Simplifies a sequence of (x,y) points, returning an (N, 2) array.
+
+    Iterative version of the recursive algorithm: each segment on the stack
+    is split at its farthest point until every point lies within epsilon.
+    Uses the numba-compiled kernel when numba is installed.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(pts)
+    if n < 3:
+        return pts
+
+    if _rdp_njit is not None:
+        xs = np.ascontiguousarray(pts[:, 0])
+        ys = np.ascontiguousarray(pts[:, 1])
+        return pts[_rdp_njit(xs, ys, float(epsilon))]
+
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        dists = perpendicular_distances(pts[lo + 1 : hi], pts[lo], pts[hi])
+        index = int(np.argmax(dists))
+        if dists[index] > epsilon:
+            split = lo + 1 + index
+            keep[split] = True
+            stack.append((lo, split))
+            stack.append((split, hi))
+
+    return pts[keep]
 
 
 # --- 2. The Logic Class ---
@@ -61,6 +132,10 @@ class VectorOptimizer:
         self.epsilon = epsilon
         self.buffer = []  # Stores (x, y) tuples
 
+        if _rdp_njit is not None:
+            # Compile up front so the first page doesn't pay the JIT latency
+            _rdp_njit(np.zeros(3), np.zeros(3), 0.0)
+
         # We create a specific registry for this instance because we need
         # to bind handlers to 'self.buffer'
         self.registry = editor.HandlerRegistry()
@@ -102,16 +177,16 @@ class VectorOptimizer:
         if not self.buffer:
             return []
 
-        # Run Algorithm
-        simplified = simplify_path(self.buffer, self.epsilon)
+        # Run Algorithm (tolist() gives plain floats, which pikepdf can encode)
+        simplified = simplify_path(self.buffer, self.epsilon).tolist()
 
         ops = []
         if simplified:
             # First point is always 'm'
-            ops.append(([simplified[0][0], simplified[0][1]], "m"))
+            ops.append((simplified[0], "m"))
             # Rest are 'l'
             for p in simplified[1:]:
-                ops.append(([p[0], p[1]], "l"))
+                ops.append((p, "l"))
 
         self.buffer = []
         return ops
@@ -132,10 +207,11 @@ if __name__ == "__main__":
 
     with pikepdf.open(input_pdf) as pdf:
         optimizer = VectorOptimizer(epsilon)
-        for i in range(len(pdf.pages)):
-            # Use the high-level API, but pass our custom registry
-            print(f"Processing page {i+1}")
-            editor.process(pdf, registry=optimizer.registry, page=i)
+        # Use the high-level API, but pass our custom registry.
+        # Processing all pages in one call lets shared resources and
+        # Form XObjects be handled once rather than once per page.
+        print(f"Processing {len(pdf.pages)} page(s)")
+        editor.process(pdf, registry=optimizer.registry, pages=range(len(pdf.pages)))
 
         pdf.save(output_pdf)
     print("Done.")
@@ -2,9 +2,11 @@
 """
 Public API for the generic PDF Stream Editor.
 """
+
 # src/pdfbeaver/api.py
 
 import logging
+import zlib
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
@@ -15,19 +17,21 @@ from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.pdftypes import PDFStream
 from pdfminer.psparser import LIT
 
-from .editor import StreamEditor
+from .editor import StreamEditor, intercepted_operators
 from .optimization import optimize_ops
+from .parallel import edit_pages_in_workers
 
 # Import the default registry from the sibling module
 from .registry import HandlerRegistry, default_registry
-from .state_iterator import StreamStateIterator
+from .state_iterator import STATELESS_OPERATORS, StreamStateIterator
 from .state_tracker import StateTracker
+from .tokenizer import UnsupportedContent, scan_operators
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
-class ProcessingOptions:
+class ProcessingOptions:  # pylint: disable=too-many-instance-attributes
     """Configuration options for the stream modification process."""
 
     optimize: bool = True
@@ -43,6 +47,23 @@ class ProcessingOptions:
 
     """
 
+    compress_streams: bool = True
+    """If True, modified content streams are Flate-compressed as they
+    are written back, so the document does not hold every page's
+    uncompressed content in memory until it is saved. Defaults to True.
+
+    """
+
+    workers: int = 1
+    """If greater than 1, :func:`process` edits the page content streams
+    in this many worker processes (Form XObjects are still edited in
+    the calling process). Handlers then run in the workers: changes they
+    make to Python objects, or to the document other than through the
+    returned instructions, are not seen by the caller. Requires
+    ``cloudpickle``. Defaults to 1.
+
+    """
+
     tracker_class: Type[StateTracker] = StateTracker
     """The class used to track PDF state (Graphics/Text) during
     parsing. Defaults to :class:`StateTracker`.  Users can subclass
@@ -62,6 +83,21 @@ class ProcessingOptions:
 
     """
 
+    resource_cache: Dict[Tuple[int, int], Any] = field(default_factory=dict)
+    """Internal cache of converted (pdfminer-style) resource objects,
+    keyed by the ``objgen`` of the indirect pikepdf object. Reusing the
+    same options across pages lets shared resources (fonts, XObjects,
+    whole ``/Resources`` dictionaries) be converted only once. Object
+    numbers are only unique within a document, so the cache is cleared
+    whenever the options are used with a different document.
+
+    """
+
+    resource_cache_pdf: Optional[pikepdf.Pdf] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """Internal: the document whose objects ``resource_cache`` holds."""
+
 
 def modify_page(
     pdf: pikepdf.Pdf,
@@ -83,24 +119,36 @@ def modify_page(
         options: Configuration options. If ``None``, defaults are used.
 
     Returns:
-        None: The page is modified in-place.
+        None: The page is modified in-place. If ``handler`` is empty and
+        ``options.optimize`` is False, the page is left untouched.
     """
     if options is None:
         options = ProcessingOptions()
+    _scope_resource_cache(options, pdf)
+
+    if handler.is_empty() and not options.optimize:
+        # Nothing could change the output: skip the parse/unparse round-trip
+        return
 
+    resources = getattr(page, "Resources", {})
     _modify_content_container(
         pdf=pdf,
         page=page,
         container=page,
-        resources=getattr(page, "Resources", {}),
+        resources=resources,
         handler=handler,
         options=options,
     )
 
     if options.recurse_xobjects:
-        _process_child_resources(
-            pdf, page, getattr(page, "Resources", {}), handler, options
-        )
+        _process_child_resources(pdf, page, resources, handler, options)
+
+
+def _scope_resource_cache(options: ProcessingOptions, pdf: pikepdf.Pdf) -> None:
+    """Empties ``options.resource_cache`` if it holds another document's objects."""
+    if options.resource_cache_pdf is not pdf:
+        options.resource_cache.clear()
+        options.resource_cache_pdf = pdf
 
 
 def _process_child_resources(
@@ -110,12 +158,17 @@ def _process_child_resources(
     handler: HandlerRegistry,
     options: ProcessingOptions,
 ) -> None:
-    """Recursively finds and modifies Form XObjects within a resource dictionary."""
-    if not isinstance(resources, pikepdf.Dictionary) or "/XObject" not in resources:
-        return
+    """Finds and modifies the Form XObjects within a resource dictionary.
+
+    The XObject tree is walked depth-first with an explicit worklist, so
+    each XObject (and its ``/Resources``) is looked up once.
+    """
+    # Worklist of (name, xobject), popped in document order
+    worklist = _child_forms(resources)
+
+    while worklist:
+        name, xobj_ref = worklist.pop()
 
-    xobjects = resources["/XObject"]
-    for name, xobj_ref in xobjects.items():
         # Dedup
         try:
             obj_id = xobj_ref.objgen
@@ -132,28 +185,58 @@ def _process_child_resources(
         logger.debug("Recursing into Form XObject: %s", name)
 
         try:
-            _modify_content_container(
-                pdf=pdf,
-                page=page,
-                container=xobj_ref,
-                resources=xobj_ref.get("/Resources", {}),
-                handler=handler,
-                options=options,
-            )
-            # Recurse
-            _process_child_resources(
-                pdf, page, xobj_ref.get("/Resources", {}), handler, options
-            )
+            xobj_resources = xobj_ref.get("/Resources", {})
+            # Decompressed once, for both the operator scan and the edit
+            content = xobj_ref.read_bytes()
+            if _may_modify(content, handler, options):
+                _modify_content_container(
+                    pdf=pdf,
+                    page=page,
+                    container=xobj_ref,
+                    resources=xobj_resources,
+                    handler=handler,
+                    options=options,
+                    content=content,
+                )
+            worklist.extend(_child_forms(xobj_resources))
         except pikepdf.PdfError as e:
             logger.warning("Skipping malformed XObject %s: %s", name, e)
 
 
-def _make_iterator_with_resources(resources):
+def _child_forms(resources: Any) -> List[Tuple[Any, Any]]:
+    """Returns the ``/XObject`` entries of ``resources``, last one first."""
+    if not isinstance(resources, pikepdf.Dictionary) or "/XObject" not in resources:
+        return []
+    return list(resources["/XObject"].items())[::-1]
+
+
+def _may_modify(
+    content: bytes, handler: HandlerRegistry, options: ProcessingOptions
+) -> bool:
+    """
+    Returns False if editing a Form XObject is known to change nothing.
+
+    That is the case when its (decompressed) ``content`` uses none of the operators
+    the editor would intercept, and no ``^``/``$`` handler is registered.
+    """
+    operators = intercepted_operators(
+        handler, optimize_ops if options.optimize else None
+    )
+    if "^" in operators or "$" in operators:
+        return True
+    try:
+        return not operators.isdisjoint(scan_operators(content))
+    except UnsupportedContent:
+        return True
+
+
+def _make_iterator_with_resources(
+    resources, cache: Optional[Dict[Tuple[int, int], Any]] = None
+):
     rsrcmgr = PDFResourceManager()
     device = PDFDevice(rsrcmgr)
     iterator = StreamStateIterator(rsrcmgr, device)
-    miner_resources = _convert_to_pdfminer_resources(resources)
-    iterator.init_resources(miner_resources)
+    iterator.init_resources(_convert_to_pdfminer_resources(resources, cache=cache))
     return iterator
 
 
@@ -165,18 +248,57 @@ def _modify_content_container(
     page: Optional[pikepdf.Page] = None,
     container: Optional[pikepdf.Object] = None,
     is_root: bool = False,
+    content: Optional[bytes] = None,
 ) -> None:
     """Core worker: modifies the content stream of a Page or XObject."""
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    data = _edit_content_container(
+        resources,
+        handler,
+        options,
+        page=page,
+        container=container,
+        is_root=is_root,
+        content=content,
+    )
+    if data is not None:
+        _write_content_container(pdf, container, data, options)
 
-    iterator = _make_iterator_with_resources(resources)
 
-    stream_list = _get_clean_content_streams(container)
+def _edit_content_container(
+    resources: Any,
+    handler: HandlerRegistry,
+    options: ProcessingOptions,
+    page: Optional[pikepdf.Page] = None,
+    container: Optional[pikepdf.Object] = None,
+    is_root: bool = False,
+    content: Optional[bytes] = None,
+) -> Optional[bytes]:
+    """
+    Runs the editor over the content stream of a Page or XObject.
+
+    ``content`` is the container's decompressed stream data, if the
+    caller has already read it. Returns the new stream data (compressed
+    if ``options.compress_streams``), or None if the container has no
+    content.
+    """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    iterator = _make_iterator_with_resources(resources, options.resource_cache)
+
+    if content is not None:
+        stream_list: List[Any] = [content]
+    else:
+        stream_list = _get_clean_content_streams(container)
     if not stream_list:
-        return
+        return None
 
-    source_stream = iterator.execute(stream_list)
-    tracker = options.tracker_class(*options.tracker_args, **options.tracker_kwargs)
     optimizer_func = optimize_ops if options.optimize else None
+    # Operators the editor only copies through need not be executed
+    passthrough = STATELESS_OPERATORS - intercepted_operators(handler, optimizer_func)
+    source_stream = iterator.execute(stream_list, passthrough=passthrough)
+    tracker = None
+    if getattr(handler, "needs_state", True):
+        tracker = options.tracker_class(*options.tracker_args, **options.tracker_kwargs)
 
     editor = StreamEditor(
         source_iterator=source_stream,
@@ -189,16 +311,32 @@ def _modify_content_container(
     )
     new_bytes = editor.process()
 
+    if options.compress_streams:
+        new_bytes = zlib.compress(new_bytes)
+    return new_bytes
+
+
+def _write_content_container(
+    pdf: Optional[pikepdf.Pdf],
+    container: Any,
+    data: bytes,
+    options: ProcessingOptions,
+) -> None:
+    """Writes data from :func:`_edit_content_container` back to its container."""
+    stream_filter = pikepdf.Name.FlateDecode if options.compress_streams else None
+
     # Write Back using the PDF object
     # pikepdf.Stream(pdf, data) is the correct constructor for new streams
     if isinstance(container, pikepdf.Page):
         # Page: replace Contents
         # Note: If previously an array, this replaces it with a single consolidated stream.
         # This is generally fine and often preferred.
-        container.Contents = pdf.make_stream(new_bytes)
+        container.Contents = pdf.make_stream(data)
+        if stream_filter:
+            container.Contents.Filter = stream_filter
     else:
         # XObject (Stream): update data in place
-        container.write(new_bytes)
+        container.write(data, filter=stream_filter)
 
 
 def _get_clean_content_streams(container: Any) -> List[Any]:
@@ -298,7 +436,11 @@ def process(
         registry: The :class:`~pdfbeaver.registry.HandlerRegistry` to use.
             Defaults to the global ``default_registry``.
         pages: The pages to process. Can be a single integer (0-indexed),
-            a single Page object, a list of integers/Pages, or None (processes all pages).
+            a single Page object, a list (or range) of integers/Pages, or None
+            (processes all pages). Prefer passing all the pages in one call over
+            calling ``process`` once per page: a single call shares one
+            :class:`ProcessingOptions` across the pages, so shared resources are
+            converted once and shared Form XObjects are only modified once.
         page: Alias for ``pages`` (kept for backward compatibility).
 
     Raises:
@@ -311,12 +453,45 @@ def process(
     if registry is None:
         registry = default_registry
 
+    if options is None:
+        options = ProcessingOptions()
+    _scope_resource_cache(options, pdf)
+
+    # Build the dispatch table once, rather than per page
+    registry.freeze()
+
     pages_to_process = _resolve_pages(pdf, pages or page)
 
+    if options.workers > 1 and len(pages_to_process) > 1:
+        _process_in_workers(pdf, pages_to_process, registry, options)
+        return
+
     for page_to_process in pages_to_process:
         modify_page(pdf, page_to_process, registry, options)
 
 
+def _process_in_workers(
+    pdf: pikepdf.Pdf,
+    pages: List[pikepdf.Page],
+    handler: HandlerRegistry,
+    options: ProcessingOptions,
+) -> None:
+    """Edits the page contents in worker processes, then their Form XObjects."""
+    if handler.is_empty() and not options.optimize:
+        return
+
+    indices = [pdf.pages.index(p) for p in pages]
+    for index, data in edit_pages_in_workers(pdf, indices, handler, options):
+        if data is not None:
+            _write_content_container(pdf, pdf.pages[index], data, options)
+
+    if options.recurse_xobjects:
+        for page in pages:
+            _process_child_resources(
+                pdf, page, getattr(page, "Resources", {}), handler, options
+            )
+
+
 def _resolve_pages(pdf: pikepdf.Pdf, pages_arg) -> List[pikepdf.Page]:
     """Helper to normalize the flexible 'pages' argument."""
     if pages_arg is None:
@@ -328,7 +503,7 @@ def _resolve_pages(pdf: pikepdf.Pdf, pages_arg) -> List[pikepdf.Page]:
     if isinstance(pages_arg, pikepdf.Page):
         return [pages_arg]
 
-    if isinstance(pages_arg, (list, tuple)):
+    if isinstance(pages_arg, (list, tuple, range)):
         resolved = []
         for item in pages_arg:
             if isinstance(item, int):
@@ -342,26 +517,21 @@ def _resolve_pages(pdf: pikepdf.Pdf, pages_arg) -> List[pikepdf.Page]:
     raise TypeError(f"Invalid type for 'pages' argument: {type(pages_arg)}")
 
 
-def _convert_to_pdfminer_resources(obj: Any, strip_slash=False) -> Any:
-    """Recursively converts pikepdf resources to types pdfminer understands."""
+def _convert_to_pdfminer_resources(
+    obj: Any,
+    strip_slash=False,
+    cache: Optional[Dict[Tuple[int, int], Any]] = None,
+) -> Any:
+    """Recursively converts pikepdf resources to types pdfminer understands.
+
+    Converted indirect objects are memoized by their ``objgen``, so
+    reference cycles terminate. If ``cache`` is given, it is used (and
+    kept) across calls, so objects shared between resource dictionaries
+    (fonts, XObjects) are converted once.
+    """
     result = obj
-    if isinstance(obj, pikepdf.Dictionary):
-        result = {
-            _convert_to_pdfminer_resources(
-                k, strip_slash=True
-            ): _convert_to_pdfminer_resources(v)
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, pikepdf.Array):
-        result = [_convert_to_pdfminer_resources(v) for v in obj]
-    elif isinstance(obj, pikepdf.Stream):
-        attrs = _convert_to_pdfminer_resources(obj.stream_dict)
-        # We pass the original raw (probably compressed) bytes.
-        # This is probably not very efficient?
-        # Might be better to pass the decompressed bytes (with read_bytes);
-        # we'd need to fix up the stream dictionary attrs in that case,
-        # at least removing any /Filter.
-        result = PDFStream(attrs, obj.read_raw_bytes())
+    if isinstance(obj, (pikepdf.Dictionary, pikepdf.Array, pikepdf.Stream)):
+        result = _convert_compound_object(obj, cache)
     elif isinstance(obj, (str, pikepdf.String)):
         s = str(obj)
         if strip_slash and s.startswith("/"):
@@ -373,3 +543,81 @@ def _convert_to_pdfminer_resources(obj: Any, strip_slash=False) -> Any:
     elif isinstance(obj, Decimal):
         result = float(obj)
     return result
+
+
+def _convert_compound_object(
+    obj: Any, cache: Optional[Dict[Tuple[int, int], Any]]
+) -> Any:
+    """Converts a Dictionary, Array or Stream, consulting ``cache``.
+
+    Without a ``cache``, a fresh one is used for this call alone.
+
+    Each (still empty) result is cached *before* its children are
+    converted, so a cycle resolves to the partially built object instead
+    of looping forever. Direct objects have no stable identity (their
+    ``objgen`` is ``(0, 0)``) and are never cached. Nested objects are
+    filled from an explicit worklist, so deep nesting cannot exhaust the
+    Python stack.
+    """
+    if cache is None:
+        cache = {}
+    result, is_new = _new_compound_object(obj, cache)
+    worklist = [(obj, result)] if is_new else []
+
+    while worklist:
+        source, target = worklist.pop()
+        if isinstance(source, pikepdf.Array):
+            target.extend(_convert_child(v, cache, worklist) for v in source)
+            continue
+        items = target.attrs if isinstance(source, pikepdf.Stream) else target
+        source = source.stream_dict if isinstance(source, pikepdf.Stream) else source
+        items.update(
+            (
+                _convert_to_pdfminer_resources(k, strip_slash=True),
+                _convert_child(v, cache, worklist),
+            )
+            for k, v in source.items()
+        )
+
+    return result
+
+
+def _convert_child(
+    obj: Any, cache: Dict[Tuple[int, int], Any], worklist: List[Any]
+) -> Any:
+    """Converts a child object, queueing new compound objects to be filled."""
+    if not isinstance(obj, (pikepdf.Dictionary, pikepdf.Array, pikepdf.Stream)):
+        return _convert_to_pdfminer_resources(obj)
+    result, is_new = _new_compound_object(obj, cache)
+    if is_new:
+        worklist.append((obj, result))
+    return result
+
+
+def _new_compound_object(
+    obj: Any, cache: Dict[Tuple[int, int], Any]
+) -> Tuple[Any, bool]:
+    """Returns the (empty) conversion of ``obj``, or its cached conversion.
+
+    The flag is True if the result is new, and still has to be filled.
+    """
+    objgen = obj.objgen
+    if objgen != (0, 0) and objgen in cache:
+        return cache[objgen], False
+
+    result: Any
+    if isinstance(obj, pikepdf.Dictionary):
+        result = {}
+    elif isinstance(obj, pikepdf.Array):
+        result = []
+    else:
+        # We pass the original raw (probably compressed) bytes.
+        # This is probably not very efficient?
+        # Might be better to pass the decompressed bytes (with read_bytes);
+        # we'd need to fix up the stream dictionary attrs in that case,
+        # at least removing any /Filter.
+        result = PDFStream({}, obj.read_raw_bytes())
+
+    if objgen != (0, 0):
+        cache[objgen] = result
+    return result, True
@@ -9,6 +9,7 @@ the content stream parsing process.
 """
 
 
+import functools
 import logging
 from dataclasses import dataclass
 from decimal import Decimal
@@ -17,6 +18,8 @@ from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
+    Iterable,
     List,
     Optional,
     Protocol,
@@ -31,6 +34,7 @@ import pikepdf
 from pdfminer.pdftypes import PDFStream
 from pikepdf import Array, Operator
 
+from .utils.pdf_conversion import unparse_instructions
 from .utils.pdf_geometry import extract_text_position
 
 if TYPE_CHECKING:
@@ -70,6 +74,16 @@ class _Sentinel:
 
 ORIGINAL_BYTES = _Sentinel("ORIGINAL_BYTES")
 
+# Larger integer operands are never re-serialized
+_MAX_SAFE_INT = 2**60
+
+# PDF whitespace byte values, as ints (what indexing bytes gives)
+_PDF_WHITESPACE = frozenset(b"\x00\t\n\x0c\r ")
+
+# Operators are immutable, and content streams use a small set of them,
+# so one instance per name is shared (bounded, for malformed streams)
+_make_operator = functools.lru_cache(maxsize=1024)(Operator)
+
 
 @dataclass(frozen=True)
 class StreamContext:
@@ -129,6 +143,46 @@ class StreamHandler(Protocol):
         """
 
 
+def intercepted_operators(
+    handler: StreamHandler, optimizer: Optional[Callable[..., Any]] = None
+) -> FrozenSet[str]:
+    """
+    Returns the operators a :class:`StreamEditor` intercepts.
+
+    These are the operators the handler modifies, plus those the optimizer
+    needs buffered (its ``relevant_operators``). Every other operator is
+    copied through as raw bytes.
+    """
+    freeze = getattr(handler, "freeze", None)
+    if freeze is not None:
+        # HandlerRegistry caches the result on its frozen table
+        return freeze().intercepted_operators(optimizer)
+    return operators_to_intercept(handler.modified_operators, optimizer)
+
+
+def operators_to_intercept(
+    operators: Iterable[str], optimizer: Optional[Callable[..., Any]] = None
+) -> FrozenSet[str]:
+    """Adds the optimizer's ``relevant_operators`` (if any) to ``operators``."""
+    result = set(operators)
+    if optimizer and hasattr(optimizer, "relevant_operators"):
+        result.update(optimizer.relevant_operators)
+    return frozenset(result)
+
+
+def _operands_are_safe(operands: List[Any]) -> bool:
+    """False if ``operands`` cannot be re-serialized (huge integers, streams)."""
+    for arg in operands:
+        if type(arg) is float:  # pylint: disable=unidiomatic-typecheck
+            continue  # the common case, and always safe
+        if isinstance(arg, int):
+            if arg > _MAX_SAFE_INT or arg < -_MAX_SAFE_INT:
+                return False
+        elif isinstance(arg, PDFStream):
+            return False
+    return True
+
+
 # --- Main Editor Class ---
 class StreamEditor:
     """
@@ -140,7 +194,7 @@ class StreamEditor:
     Args:
         source_iterator: Iterator yielding parsed PDF operators and state.
         handler: The logic registry.
-        tracker: The state tracker.
+        tracker: The state tracker, or None if no handler needs one.
         optimizer: Optional optimization function.
         page: The pikepdf Page being edited.
         container: The container object (Page or XObject).
@@ -167,19 +221,21 @@ class StreamEditor:
         self.container = container
         self.is_page_root = is_page_root
 
-        self.last_input_pos = np.array([0.0, 0.0, 1.0])
-        self._pending_ops: List[Union[ContentStreamInstruction, _Sentinel]] = []
-        self._final_chunks: List[bytes] = []
+        self._last_input_pos = np.array([0.0, 0.0, 1.0])
+        # State last_input_pos must be computed from, when next read
+        self._position_state: Optional[Dict[str, Any]] = None
+        # State the tracker must be synced to before the next handler call
+        self._tracker_state: Optional[Dict[str, Any]] = None
+        self._pending_ops: List[ContentStreamInstruction] = []
+        # The output stream, built in place
+        self._final_chunks = bytearray()
 
         # --- Interception Logic (Step 6) ---
         # The editor intercepts operators if:
         # A) The Handler wants to modify them
         # B) The Optimizer needs them to be buffered (context)
-        self.handler_ops = self.handler.modified_operators
-        self.intercept_list = set(self.handler_ops)
-
-        if self.optimizer and hasattr(self.optimizer, "relevant_operators"):
-            self.intercept_list.update(self.optimizer.relevant_operators)
+        self.handler_ops = frozenset(self.handler.modified_operators)
+        self.intercept_list = intercepted_operators(self.handler, self.optimizer)
 
     def _normalize_instruction(self, item: Any):
         """
@@ -193,11 +249,13 @@ class StreamEditor:
             return item
         if isinstance(item, str):
             # implicit operator
-            return ([], Operator(item))
+            return ([], _make_operator(item))
         if isinstance(item, Operator):
             # actual operator
             return ([], item)
-        if item == [ORIGINAL_BYTES]:  # fix a reasonable user error
+        if (
+            isinstance(item, list) and len(item) == 1 and item[0] is ORIGINAL_BYTES
+        ):  # fix a reasonable user error
             return ORIGINAL_BYTES
         raise ValueError(f"Could not normalize instruction: {item}")
 
@@ -205,7 +263,9 @@ class StreamEditor:
         if len(item) == 2:
             ops, operator = item
             if isinstance(operator, str):
-                operator = Operator(operator)
+                operator = _make_operator(operator)
+            elif type(ops) is list:  # pylint: disable=unidiomatic-typecheck
+                return item  # already normalized
             if not isinstance(ops, (list, tuple, Array)):
                 ops = [ops]
             return (ops, operator)
@@ -237,6 +297,20 @@ class StreamEditor:
             + "\n)"
         )
 
+    @property
+    def last_input_pos(self) -> np.ndarray:
+        """The text position after the last operator, in user space."""
+        # Computed lazily: few callers read it, unlike the operators setting it
+        if self._position_state is not None:
+            self._last_input_pos = extract_text_position(self._position_state)
+            self._position_state = None
+        return self._last_input_pos
+
+    @last_input_pos.setter
+    def last_input_pos(self, value: np.ndarray):
+        self._last_input_pos = value
+        self._position_state = None
+
     @property
     def current_position(self) -> np.ndarray:
         """Return current position"""
@@ -244,8 +318,9 @@ class StreamEditor:
 
     def process(self) -> bytes:
         """Executes the editing process and returns the new stream bytes."""
-        self._final_chunks = []
+        self._final_chunks = bytearray()
         self._pending_ops = []
+        self._tracker_state = None
         pre_input_state = None
 
         self._call_special_handler("^", None)
@@ -256,8 +331,8 @@ class StreamEditor:
         self._call_special_handler("$", pre_input_state)
 
         self._flush_pending()
-        ret = b"".join(self._final_chunks) + b"\n"
-        return ret
+        self._final_chunks += b"\n"
+        return bytes(self._final_chunks)
 
     def _process_step(self, step, pre_input_state):
 
@@ -265,12 +340,14 @@ class StreamEditor:
         operands = step["operands"]
         post_input_state = step["state"]
         raw_bytes = step.get("raw_bytes", b"")
-        # 1. Update Tracker with PRE-input state from engine
+        # 1. Remember the PRE-input state from the engine. The tracker is only
+        # visible to handlers, so it is synced lazily, in _call_handler.
         if pre_input_state:
-            self.tracker.set_state(pre_input_state)
+            self._tracker_state = pre_input_state
 
-        # 2. Check optimization/interception safety
-        if self._is_safe_to_optimize(op, operands, self.intercept_list):
+        # 2. Check optimization/interception safety (inlined: most
+        # operators are not intercepted, and need no operand checks)
+        if op in self.intercept_list and _operands_are_safe(operands):
 
             if op in self.handler_ops:
                 # Case A: The Handler wants to modify this
@@ -290,17 +367,20 @@ class StreamEditor:
             self._append_chunk(self._final_chunks, raw_bytes)
 
         # 3. Advance Input State Tracking
-        pre_input_state = post_input_state
-        if pre_input_state:
-            self.last_input_pos = extract_text_position(pre_input_state)
+        # (the iterator reuses the snapshot for operators that change no state)
+        if post_input_state and post_input_state is not pre_input_state:
+            self._position_state = post_input_state
 
-        return pre_input_state
+        return post_input_state
 
     def _call_special_handler(self, op, state):
         if op in self.handler_ops:
             self._call_handler(op, None, None, state, state)
 
     def _call_handler(self, op, operands, raw_bytes, pre_input_state, post_input_state):
+        if self._tracker_state is not None and self.tracker is not None:
+            self.tracker.set_state(self._tracker_state)
+            self._tracker_state = None
         ctx = StreamContext(
             pre_input=pre_input_state,
             post_input=post_input_state,
@@ -311,21 +391,6 @@ class StreamEditor:
         )
         self._buffer_modified_op(op, operands, ctx, raw_bytes)
 
-    def _is_safe_to_optimize(
-        self, op: str, operands: List[Any], intercept_list: Set[str]
-    ) -> bool:
-        if op not in intercept_list:
-            return False
-        if any(
-            isinstance(arg, int)
-            and (arg > 1152921504606846976 or arg < -1152921504606846976)
-            for arg in operands
-        ):
-            return False
-        if any(isinstance(arg, PDFStream) for arg in operands):
-            return False
-        return True
-
     def _buffer_modified_op(self, op, operands, context, raw_bytes):
         # Generic Handler Call
         new_ops_or_sentinels = self.handler.handle_operator(
@@ -339,45 +404,39 @@ class StreamEditor:
             new_ops_or_sentinels = [[new_ops_or_sentinels]]
 
         for item in new_ops_or_sentinels:
+            if item is not ORIGINAL_BYTES:
+                item = self._normalize_instruction(item)
             if item is ORIGINAL_BYTES:
-                self._pending_ops.append((operands, Operator(op)))
-            else:
-                normalized = self._normalize_instruction(item)
-                if isinstance(normalized, bytes):
-                    # Direct binary injection
-                    self._flush_pending()
-                    self._append_chunk(self._final_chunks, normalized)
-                elif normalized:
-                    self._pending_ops.append(normalized)
+                self._pending_ops.append((operands, _make_operator(op)))
+            elif isinstance(item, bytes):
+                # Direct binary injection
+                self._flush_pending()
+                self._append_chunk(self._final_chunks, item)
+            elif item:
+                self._pending_ops.append(item)
 
     def _flush_pending(self):
+        # Only instructions are buffered: bytes are written out directly,
+        # and ORIGINAL_BYTES is replaced by the original instruction
         if self._pending_ops:
             if self.optimizer:
-                optimizable = [
-                    x
-                    for x in self._pending_ops
-                    if not isinstance(x, (bytes, _Sentinel))
-                ]
-                optimized = self.optimizer(optimizable)
+                optimized = self.optimizer(self._pending_ops)
             else:
-                optimized = [
-                    x
-                    for x in self._pending_ops
-                    if not isinstance(x, (bytes, _Sentinel))
-                ]
+                optimized = self._pending_ops
 
             if optimized:
-                chunk = pikepdf.unparse_content_stream(optimized)
+                chunk = unparse_instructions(optimized)
                 self._append_chunk(self._final_chunks, chunk)
             self._pending_ops.clear()
 
-    def _append_chunk(self, chunks: List[bytes], chunk: bytes):
+    def _append_chunk(self, buffer: bytearray, chunk: bytes):
         if not chunk:
             return
-        if chunks:
-            last = chunks[-1]
-            if not (last and last[-1] in b"\x00\t\n\x0c\r ") and not (
-                chunk and chunk[0] in b"\x00\t\n\x0c\r "
-            ):
-                chunks.append(b"\n")
-        chunks.append(chunk)
+        # Separate from the previous chunk unless whitespace already does
+        if (
+            buffer
+            and buffer[-1] not in _PDF_WHITESPACE
+            and chunk[0] not in _PDF_WHITESPACE
+        ):
+            buffer += b"\n"
+        buffer += chunk
@@ -4,7 +4,7 @@ Logic for optimizing PDF content streams (peephole optimization).
 """
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +20,41 @@ CONVERSION_ERRORS = (ValueError, IndexError, TypeError, OverflowError)
 # }
 
 
+# Text-showing operators consume all pending state
+TEXT_SHOWING_OPERATORS = frozenset(("Tj", "TJ", "'", '"'))
+
+# The stores the optimizer may remove
+STORE_OPERATORS = frozenset(("Tm", "Td", "Tz", "Tf"))
+
+
 @dataclass
 class OptimizerState:
-    """Tracks the current graphics state during the forward optimization pass."""
+    """Tracks the current text state during the optimization pass."""
 
     current_tz: float = 100.0
     current_tf_name: Optional[str] = None
     current_tf_size: Optional[float] = None
-    current_tm: Optional[List[float]] = None
     simple_states: Dict[str, List[Any]] = field(default_factory=dict)
 
 
 def optimize_ops(ops: List[Tuple[List[Any], Any]]) -> List[Tuple[List[Any], Any]]:
     """
-    Orchestrates the two-pass optimization strategy.
+    Runs the peephole optimizer over a list of operators, in a single pass.
 
-    1. **Reverse Pass:** Removes 'Dead Stores' (values set but overwritten before use).
-    2. **Forward Pass:** Removes redundant sets and converts absolute matrices (Tm)
-       to relative moves (Td) where possible.
+    1. **Dead Stores:** Removes values set but overwritten before use
+       (before the next text-showing operator).
+    2. **Redundant Sets:** Removes Tz and Tf operators that set the
+       current value.
     """
     if not ops:
         return []
 
-    # Pass 1: Reverse Dead-Store Elimination
-    ops_pass1 = _remove_dead_stores(ops)
-
-    # Pass 2: Forward Redundancy & Consolidation
-    return _consolidate_redundant_ops(ops_pass1)
+    # Without stores there is nothing to remove (e.g. in graphics-only
+    # streams), and a scan is cheaper than the full pass
+    for _, operator in ops:
+        if str(operator) in STORE_OPERATORS:
+            return _PeepholePass().run(ops)
+    return list(ops)
 
 
 # --- Metadata ---
@@ -67,106 +75,97 @@ optimize_ops.relevant_operators = {
 }
 
 
-def _remove_dead_stores(
-    ops: List[Tuple[List[Any], Any]],
-) -> List[Tuple[List[Any], Any]]:
-    """
-    Backward pass: removes operations that set a state which is immediately
-    overwritten without being used.
+class _PeepholePass:
     """
-    rev_optimized = []
-    future_overwrites: Set[str] = set()
-
-    for operands, operator in reversed(ops):
-        op_name = str(operator)
-
-        # Barrier: Text operations consume all state
-        if op_name in ["Tj", "TJ", "'", '"']:
-            future_overwrites.clear()
-            rev_optimized.append((operands, operator))
-            continue
-
-        if _is_dead_store(op_name, future_overwrites):
-            continue
-
-        _update_overwrites(op_name, future_overwrites)
-        rev_optimized.append((operands, operator))
-
-    return list(reversed(rev_optimized))
-
-
-def _is_dead_store(op_name: str, future_overwrites: Set[str]) -> bool:
-    """Checks if the current operator is overwritten by a future one."""
-    if op_name == "Tm":
-        return "Tm" in future_overwrites
-    if op_name == "Td":
-        # Td is relative, but if a Tm follows, Td is useless (absolute reset)
-        return "Tm" in future_overwrites
-    if op_name == "Tz":
-        return "Tz" in future_overwrites
-    if op_name == "Tf":
-        return "Tf" in future_overwrites
-    return False
-
-
-def _update_overwrites(op_name: str, future_overwrites: Set[str]):
-    """Updates the set of overwritten states based on the current operator."""
-    if op_name == "Tm":
-        future_overwrites.add("Tm")
-        future_overwrites.add("Td")  # Tm resets translation too
-    elif op_name == "Tz":
-        future_overwrites.add("Tz")
-    elif op_name == "Tf":
-        future_overwrites.add("Tf")
-
+    The state machine behind :func:`optimize_ops`.
 
-def _consolidate_redundant_ops(
-    ops: List[Tuple[List[Any], Any]],
-) -> List[Tuple[List[Any], Any]]:
+    Stores seen since the last text-showing operator are *pending*: they
+    are written to the output, but a later store of the same state
+    overwrites them, clearing their slot. At each text-showing operator
+    (and at the end) the surviving Tz/Tf stores are checked against the
+    current state, and dropped if redundant.
     """
-    Forward pass:
-    1. Removes operations that set the state to its current value.
-    2. Converts Tm -> Td (Absolute -> Relative) to save bytes.
-    """
-    final_optimized = []
-    state = OptimizerState()
-
-    for operands, operator in ops:
-        op_name = str(operator)
-        result = None
-
-        if op_name == "Tz":
-            result = _handle_tz(operands, operator, state)
-        elif op_name == "Tf":
-            result = _handle_tf(operands, operator, state)
-        elif op_name == "Tm":
-            result = _handle_tm(operands, operator, state)
-        elif op_name == "Td":
-            result = _handle_td(operands, operator, state)
-        elif op_name == "BT":
-            state.current_tm = None
-            result = (operands, operator)
-        else:
-            result = (operands, operator)
-
-        if result:
-            final_optimized.append(result)
-
-    return final_optimized
-
-
-def _handle_tz(operands, operator, state: OptimizerState):
+
+    def __init__(self):
+        self.state = OptimizerState()
+        self.output: List[Optional[Tuple[List[Any], Any]]] = []
+        # Output indices of pending Tm/Td (a Tm overwrites both)
+        self.pending_moves: List[int] = []
+        # Output index of the pending Tz and Tf
+        self.pending_tz: Optional[int] = None
+        self.pending_tf: Optional[int] = None
+
+    def run(self, ops: List[Tuple[List[Any], Any]]) -> List[Tuple[List[Any], Any]]:
+        """Optimizes ``ops``, returning a new list."""
+        output = self.output
+        dispatch = self._dispatch
+
+        for operands, operator in ops:
+            # One str() and one dict lookup per operator; most operators
+            # have no rule and get no further work
+            rule = dispatch.get(str(operator))
+            if rule is not None:
+                rule(self)
+            output.append((operands, operator))
+
+        self._resolve_pending()
+        return [op for op in output if op is not None]
+
+    def _on_tm(self):
+        for index in self.pending_moves:
+            self.output[index] = None
+        self.pending_moves = [len(self.output)]
+
+    def _on_td(self):
+        self.pending_moves.append(len(self.output))
+
+    def _on_tz(self):
+        if self.pending_tz is not None:
+            self.output[self.pending_tz] = None
+        self.pending_tz = len(self.output)
+
+    def _on_tf(self):
+        if self.pending_tf is not None:
+            self.output[self.pending_tf] = None
+        self.pending_tf = len(self.output)
+
+    def _resolve_pending(self):
+        """Commits the surviving stores, dropping those that change nothing."""
+        output = self.output
+        if self.pending_tz is not None:
+            if _is_redundant_tz(output[self.pending_tz][0], self.state):
+                output[self.pending_tz] = None
+            self.pending_tz = None
+        if self.pending_tf is not None:
+            if _is_redundant_tf(output[self.pending_tf][0], self.state):
+                output[self.pending_tf] = None
+            self.pending_tf = None
+        self.pending_moves = []
+
+    # Rules run before an operator is appended to the output, by name
+    _dispatch = {
+        "Tm": _on_tm,
+        "Td": _on_td,
+        "Tz": _on_tz,
+        "Tf": _on_tf,
+        **dict.fromkeys(TEXT_SHOWING_OPERATORS, _resolve_pending),
+    }
+
+
+def _is_redundant_tz(operands, state: OptimizerState) -> bool:
+    """Checks a Tz against the current scaling, updating the state if it changes."""
     try:
         new_tz = float(operands[0])
         if abs(new_tz - state.current_tz) < TZ_TOL:
-            return None  # Redundant
+            return True
         state.current_tz = new_tz
-        return (operands, operator)
     except CONVERSION_ERRORS:
-        return (operands, operator)
+        pass
+    return False
 
 
-def _handle_tf(operands, operator, state: OptimizerState):
+def _is_redundant_tf(operands, state: OptimizerState) -> bool:
+    """Checks a Tf against the current font, updating the state if it changes."""
     try:
         new_name = str(operands[0])
         new_size = float(operands[1])
@@ -175,41 +174,9 @@ def _handle_tf(operands, operator, state: OptimizerState):
             and state.current_tf_size is not None
             and abs(new_size - state.current_tf_size) < TF_TOL
         ):
-            return None  # Redundant
+            return True
         state.current_tf_name = new_name
         state.current_tf_size = new_size
-        return (operands, operator)
     except (ValueError, IndexError, TypeError):
-        return (operands, operator)
-
-
-def _handle_tm(operands, operator, state: OptimizerState):
-    # We cannot optimize Tm -> Td safely without text width calculation,
-    # because any intervening Tj invalidates the state.
-    # We just update the tracker and pass it through.
-
-    try:
-        # Always update state to the new absolute matrix
-        state.current_tm = [float(x) for x in operands]
-    except CONVERSION_ERRORS:
-        state.current_tm = None
-
-    return (operands, operator)
-
-
-def _handle_td(operands, operator, state: OptimizerState):
-    if state.current_tm is not None:
-        try:
-            tx, ty = float(operands[0]), float(operands[1])
-            a, b, c, d = (
-                state.current_tm[0],
-                state.current_tm[1],
-                state.current_tm[2],
-                state.current_tm[3],
-            )
-            # Update tracked matrix e/f
-            state.current_tm[4] += (tx * a) + (ty * c)
-            state.current_tm[5] += (tx * b) + (ty * d)
-        except CONVERSION_ERRORS:
-            state.current_tm = None
-    return (operands, operator)
+        pass
+    return False
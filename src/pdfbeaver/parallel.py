@@ -0,0 +1,94 @@
+# src/pdfbeaver/parallel.py
+"""Module: pdfbeaver.parallel
+
+Edits page content streams in worker processes (see
+:attr:`~pdfbeaver.api.ProcessingOptions.workers`).
+
+Each worker opens its own copy of the document, from a snapshot saved
+by the parent, and edits the pages it is given. Only the new content
+stream data is sent back; the parent writes it into the original
+document. Registries usually hold closures, which the standard
+``pickle`` cannot serialize, so they are shipped with ``cloudpickle``.
+"""
+
+import dataclasses
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import pikepdf
+
+if TYPE_CHECKING:
+    from .api import ProcessingOptions
+    from .registry import HandlerRegistry
+
+# Per-process state, set up by _init_worker
+_WORKER: Dict[str, Any] = {}
+
+
+def edit_pages_in_workers(
+    pdf: pikepdf.Pdf,
+    indices: List[int],
+    handler: "HandlerRegistry",
+    options: "ProcessingOptions",
+) -> List[Tuple[int, Optional[bytes]]]:
+    """
+    Edits the content streams of the pages at ``indices`` in parallel.
+
+    Returns ``(index, data)`` pairs, where ``data`` is the new content
+    stream data (as returned by ``_edit_content_container``), or None if
+    the page has no content.
+
+    Raises:
+        ImportError: If ``cloudpickle`` is not installed.
+    """
+    try:
+        import cloudpickle  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            "ProcessingOptions.workers > 1 requires cloudpickle "
+            "(pip install pdfbeaver[parallel])"
+        ) from e
+
+    snapshot = io.BytesIO()
+    pdf.save(snapshot)
+
+    # Each worker builds its own caches
+    worker_options = dataclasses.replace(
+        options, workers=1, visited_streams=set(), resource_cache={}
+    )
+    payload = cloudpickle.dumps((handler, worker_options))
+
+    workers = min(options.workers, len(indices))
+    chunksize = max(1, len(indices) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(snapshot.getvalue(), payload),
+    ) as executor:
+        return list(executor.map(_edit_page, indices, chunksize=chunksize))
+
+
+def _init_worker(pdf_data: bytes, payload: bytes) -> None:
+    """Opens the document snapshot and loads the registry and options."""
+    import cloudpickle  # pylint: disable=import-outside-toplevel
+
+    _WORKER["pdf"] = pikepdf.open(io.BytesIO(pdf_data))
+    _WORKER["handler"], _WORKER["options"] = cloudpickle.loads(payload)
+
+
+def _edit_page(index: int) -> Tuple[int, Optional[bytes]]:
+    """Edits the content stream of one page of the worker's document."""
+    # pylint: disable=import-outside-toplevel, cyclic-import
+    from .api import _edit_content_container
+
+    page = _WORKER["pdf"].pages[index]
+    data = _edit_content_container(
+        getattr(page, "Resources", {}),
+        _WORKER["handler"],
+        _WORKER["options"],
+        page=page,
+        container=page,
+        is_root=True,
+    )
+    return index, data
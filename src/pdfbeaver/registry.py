@@ -8,17 +8,89 @@ but allows function-based registration with flexible signatures.
 
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Set, Union
+import sys
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
 
 from .editor import (
     ORIGINAL_BYTES,
     ContentStreamInstruction,
     NormalizedOperand,
     StreamContext,
+    operators_to_intercept,
 )
 
 logger = logging.getLogger(__name__)
 
+# Handler parameter name -> the expression for its value, in terms of a
+# wrapper's arguments (operands, context, raw_bytes, op_name)
+_ARGUMENT_SOURCES: Dict[str, str] = {
+    "args": "operands",
+    "arguments": "operands",
+    "container": "context.container if context else None",
+    "context": "context",
+    "op": "op_name",
+    "operands": "operands",
+    "operator": "op_name",
+    "page": "context.page if context else None",
+    "pdf": "context.pdf if context else None",
+    "raw_bytes": "raw_bytes",
+}
+
+
+def _make_wrapper(
+    func: Callable, params: Iterable[str], normalize: Callable[[Any], List[Any]]
+) -> Callable:
+    """
+    Returns ``wrapper(operands, context, raw_bytes, op_name)``, which calls
+    ``func`` with the arguments named by ``params``, then ``normalize``.
+
+    The wrapper is compiled for this exact signature (as
+    :mod:`dataclasses` does for ``__init__``), so a call passes each
+    keyword argument directly, with no dict built per operator. Only
+    names from :data:`_ARGUMENT_SOURCES` reach the generated source.
+    """
+    kwargs = ", ".join(f"{name}=({_ARGUMENT_SOURCES[name]})" for name in sorted(params))
+    source = (
+        "def wrapper(operands, context, raw_bytes, op_name):\n"
+        f"    return normalize(func({kwargs}))\n"
+    )
+    namespace: Dict[str, Any] = {"func": func, "normalize": normalize}
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace["wrapper"]
+
+
+# pylint: disable=too-few-public-methods
+class HandlerTable:
+    """
+    An immutable snapshot of a registry's handlers, used for dispatch.
+
+    Built once by :meth:`HandlerRegistry.freeze` and reused for every
+    operator (and every page) until the registry changes. Operator names
+    are interned, like those produced by the tokenizer, so lookups
+    usually succeed on identity alone.
+    """
+
+    __slots__ = ("handlers", "operators", "needs_state", "_intercepts")
+
+    def __init__(self, handlers: Dict[str, Callable]):
+        self.handlers: Dict[str, Callable] = {
+            sys.intern(op): handler for op, handler in handlers.items()
+        }
+        self.operators: FrozenSet[str] = frozenset(self.handlers)
+        self.needs_state: bool = any(
+            getattr(handler, "needs_context", True)
+            for handler in self.handlers.values()
+        )
+        self._intercepts: Dict[Any, FrozenSet[str]] = {}
+
+    def intercepted_operators(self, optimizer: Any = None) -> FrozenSet[str]:
+        """Returns (and caches) the operators intercepted with ``optimizer``."""
+        intercepts = self._intercepts.get(optimizer)
+        if intercepts is None:
+            intercepts = operators_to_intercept(self.operators, optimizer)
+            self._intercepts[optimizer] = intercepts
+        return intercepts
+
 
 class HandlerRegistry:
     """
@@ -29,14 +101,39 @@ class HandlerRegistry:
 
     def __init__(self):
         self._handlers: Dict[str, Callable] = {}
+        self._table: Optional[HandlerTable] = None
         # Helper for users to return "do nothing" (pass-through)
         # pylint: disable=invalid-name
         self.PASS_THROUGH = [ORIGINAL_BYTES]
 
     @property
-    def modified_operators(self) -> Set[str]:
+    def modified_operators(self) -> FrozenSet[str]:
         """Returns the set of operators registered for interception."""
-        return set(self._handlers.keys())
+        return self.freeze().operators
+
+    @property
+    def needs_state(self) -> bool:
+        """
+        True if any registered handler takes a ``context`` argument.
+
+        Handlers can only reach the state tracker through the context, so
+        when this is False the stream is edited without one.
+        """
+        return self.freeze().needs_state
+
+    def is_empty(self) -> bool:
+        """Returns True if no handlers (including ``^`` and ``$``) are registered."""
+        return not self._handlers
+
+    def freeze(self) -> HandlerTable:
+        """
+        Returns the dispatch table for the currently registered handlers.
+
+        The table is cached, and rebuilt only after a new registration.
+        """
+        if self._table is None:
+            self._table = HandlerTable(self._handlers)
+        return self._table
 
     def register(self, *ops: str):
         """
@@ -66,45 +163,19 @@ class HandlerRegistry:
         def decorator(func: Callable):
             sig = inspect.signature(func)
             params = set(sig.parameters)
-            allowed_params = {
-                "args",
-                "arguments",
-                "container",
-                "context",
-                "op",
-                "operands",
-                "operator",
-                "page",
-                "pdf",
-                "raw_bytes",
-            }
-
-            if bad_param := any((x not in allowed_params for x in params)):
+
+            if bad_params := params.difference(_ARGUMENT_SOURCES):
                 raise ValueError(
-                    f"Parameter name {bad_param} not allowed. "
-                    f"Allowed parameter names are: {allowed_params}"
+                    f"Parameter names {sorted(bad_params)} not allowed. "
+                    f"Allowed parameter names are: {sorted(_ARGUMENT_SOURCES)}"
                 )
 
-            def wrapper(operands, context, raw_bytes, op_name):
-                kwargs_all = {
-                    "args": operands,
-                    "arguments": operands,
-                    "container": context.container if context else None,
-                    "context": context,
-                    "op": op_name,
-                    "operands": operands,
-                    "operator": op_name,
-                    "page": context.page if context else None,
-                    "pdf": context.pdf if context else None,
-                    "raw_bytes": raw_bytes,
-                }
-                kwargs = {k: kwargs_all[k] for k in params}
-
-                result = func(**kwargs)
-                return self._normalize_return_value(result)
+            wrapper = _make_wrapper(func, params, self._normalize_return_value)
+            wrapper.needs_context = "context" in params
 
             for op in ops:
                 self._handlers[op] = wrapper
+            self._table = None
             return func
 
         return decorator
@@ -114,18 +185,25 @@ class HandlerRegistry:
         Ensures the handler return value is always a list of instructions.
         Allows users to return single items (str, bytes, tuple) without wrapping in [].
         """
+        result_type = type(result)
+        if result_type is list:
+            return result
         if result is None:
             return []
 
-        # If it's a list (and not a string/bytes), assume it's a list of instructions
+        # Common single items (str, bytes, tuple) need no further checks
+        if result_type is tuple or result_type is bytes or result_type is str:
+            return [result]
+
+        # If it's a list subclass, assume it's a list of instructions
         if isinstance(result, list):
             return result
 
-        # Handle generators
-        if isinstance(result, (map, filter)) or inspect.isgenerator(result):
+        # Handle generators, map, filter and other iterators
+        if hasattr(result, "__next__"):
             return list(result)
 
-        # If it's a single item (str, bytes, tuple, Sentinel), wrap it
+        # Any other single item (e.g. a Sentinel): wrap it
         return [result]
 
     def handle_operator(
@@ -138,7 +216,7 @@ class HandlerRegistry:
         """
         Standard entry point called by StreamEditor.
         """
-        handler = self._handlers.get(op)
+        handler = self.freeze().handlers.get(op)
         if not handler:
             return [raw_bytes]
 
@@ -14,19 +14,43 @@ customized PDF content stream parser and iterator.
 """
 
 import logging
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import sys
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import numpy as np
 from pdfminer.pdfdevice import PDFDevice
 from pdfminer.pdfinterp import PDFContentParser, PDFPageInterpreter, PDFResourceManager
 from pdfminer.pdftypes import PDFStream
 from pdfminer.psparser import PSEOF, PSKeyword
 
-from .utils.pdf_conversion import normalize_pdf_operand
+from .tokenizer import UnsupportedContent, tokenize
+from .utils.pdf_conversion import normalize_pdf_operands
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Operators which change nothing in the captured state: path construction,
+# painting, clipping, marked content, shading and XObject invocation.
+STATELESS_OPERATORS = frozenset(
+    (
+        *("m", "l", "c", "v", "y", "h", "re"),
+        *("S", "s", "f", "F", "f*", "B", "B*", "b", "b*", "n", "W", "W*"),
+        *("BMC", "BDC", "EMC", "MP", "DP", "BX", "EX", "sh", "Do"),
+    )
+)
+
+# Byte values for which bytes.isspace() is true
+_ASCII_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+
 
 class StreamStateIterator(PDFPageInterpreter):
     """Iterates over a content stream, yielding detailed state steps.
@@ -46,17 +70,21 @@ class StreamStateIterator(PDFPageInterpreter):
     """
 
     def __init__(self, rsrcmgr: PDFResourceManager, device: PDFDevice):
+        # Operator name -> bound do_* method (or None), filled as operators
+        # are seen; cleared by execute(), so later overrides are picked up
+        self._operator_methods: Dict[str, Optional[Callable[..., Any]]] = {}
+        # Font -> {string: unscaled width}; fonts are immutable and streams
+        # repeat the same strings, so each width is computed only once
+        self._string_widths: Dict[Any, Dict[Any, float]] = {}
         super().__init__(rsrcmgr, device)
         self.init_state(ctm=(1, 0, 0, 1, 0, 0))
         super().init_resources({})
 
     def capture_state(self) -> Dict[str, Any]:
         """Captures and returns a snapshot of current graphics and text state."""
+        # The matrices are immutable tuples, so the shallow copy suffices
         tstate = self.textstate.copy()
 
-        tstate.matrix = list(tstate.matrix)
-        tstate.linematrix = list(tstate.linematrix)
-
         gstate = self.graphicstate.copy()
 
         font_name: Optional[str] = None
@@ -93,8 +121,27 @@ class StreamStateIterator(PDFPageInterpreter):
 
     def _consolidate_streams(self, streams: Sequence[object]) -> bytes:
         """Consolidates multiple stream objects into a single bytes object."""
-        combined_data = bytearray()
+        if len(streams) == 1 and isinstance(streams[0], bytes):
+            # Nothing to join: avoid copying (possibly large) stream data
+            return streams[0].strip()
+
+        parts: List[bytes] = []
         for s in streams:
+            # Plain bytes (the common case) need no resolving or reading
+            data = s if isinstance(s, bytes) else self._read_stream(s)
+            parts.append(data)
+            if not data or data[-1] not in _ASCII_WHITESPACE:
+                parts.append(b" ")
+
+        if parts and parts[-1] == b" ":
+            parts.pop()  # would be stripped anyway
+        # One join (which sizes the result up front), and at most one strip
+        return b"".join(parts).strip()
+
+    @staticmethod
+    def _read_stream(s: object) -> bytes:
+        """Resolves a stream-like object (pdfminer or pikepdf) and reads it."""
+        if hasattr(s, "resolve"):
             seen_ids = set()
             while hasattr(s, "resolve"):
                 if id(s) in seen_ids:
@@ -102,22 +149,16 @@ class StreamStateIterator(PDFPageInterpreter):
                     break
                 seen_ids.add(id(s))
                 s = s.resolve()
-            if hasattr(s, "get_data"):
-                data = s.get_data()
-            elif hasattr(s, "get_rawdata"):
-                data = s.get_rawdata()
-            elif hasattr(s, "read_bytes"):
-                data = s.read_bytes()
-            elif isinstance(s, bytes):
-                data = s
-            else:
-                data = str(s).encode("latin1")
-
-            combined_data.extend(data)
-            if not data[-1:].isspace():
-                combined_data.extend(b" ")
-
-        return bytes(combined_data.strip())
+        read = (
+            getattr(s, "get_data", None)
+            or getattr(s, "get_rawdata", None)
+            or getattr(s, "read_bytes", None)
+        )
+        if read is not None:
+            return read()
+        if isinstance(s, bytes):
+            return s
+        return str(s).encode("latin1")
 
     def _process_operator(
         self,
@@ -129,12 +170,39 @@ class StreamStateIterator(PDFPageInterpreter):
     ) -> Tuple[Dict[str, Any], int]:
         # pylint: disable=too-many-arguments, too-many-positional-arguments
         """Executes operator logic, captures state, and extracts raw bytes."""
+        cmd_end_pos = self._get_parser_pos(parser)
+
+        if cmd_end_pos < cmd_start_pos:
+            # pdfminer seems to set position to 0 on EOF
+            # so we just consume everything remaining
+            cmd_end_pos = len(final_bytes)
+
+        return (
+            self._make_step(
+                op_name, proc_stack, final_bytes, cmd_start_pos, cmd_end_pos
+            ),
+            cmd_end_pos,
+        )
+
+    def _make_step(
+        self,
+        op_name: str,
+        proc_stack: List[Any],
+        final_bytes: bytes,
+        cmd_start_pos: int,
+        cmd_end_pos: int,
+    ) -> Dict[str, Any]:
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        """Runs the operator, then builds the step dictionary for it."""
 
         # if op_name in ('Tj', 'TJ'):
         # 1. Execute Internal Logic (State Tracking)
-        func_name = f"do_{op_name}"
-        if hasattr(self, func_name):
-            func = getattr(self, func_name)
+        try:
+            func = self._operator_methods[op_name]
+        except KeyError:
+            func = getattr(self, f"do_{op_name}", None)
+            self._operator_methods[op_name] = func
+        if func is not None:
             try:
                 func(*proc_stack)
             except TypeError as e:
@@ -144,13 +212,6 @@ class StreamStateIterator(PDFPageInterpreter):
         current_state = self.capture_state()
 
         # 3. Extract Raw Bytes for Pass-Through
-        cmd_end_pos = self._get_parser_pos(parser)
-
-        if cmd_end_pos < cmd_start_pos:
-            # pdfminer seems to set position to 0 on EOF
-            # so we just consume everything remaining
-            cmd_end_pos = len(final_bytes)
-
         # Check range validity
         if cmd_end_pos >= cmd_start_pos >= 0:
             raw_bytes = final_bytes[cmd_start_pos:cmd_end_pos]
@@ -158,32 +219,70 @@ class StreamStateIterator(PDFPageInterpreter):
             raw_bytes = b""
 
         # 4. Normalize
-        clean_operands = list(map(normalize_pdf_operand, proc_stack))
+        clean_operands = normalize_pdf_operands(proc_stack)
 
-        result = {
+        return {
             "operator": op_name,
             "operands": clean_operands,
             "state": current_state,  # copy.deepcopy(current_state),
             "raw_bytes": raw_bytes,
         }
-        return result, cmd_end_pos
 
     def execute(
-        self, streams: Sequence[object]
-    ) -> Iterator[Dict[str, Any]]:  # type:ignore
+        self, streams: Sequence[object], passthrough: AbstractSet[str] = frozenset()
+    ) -> Iterator[Dict[str, Any]]:  # type: ignore
         """
         Parses the streams and yields step dictionaries.
+
+        Args:
+            streams: The content streams to parse, in order.
+            passthrough: Operators (from :data:`STATELESS_OPERATORS`) that
+                the caller will only copy through. These are not executed,
+                and their step reuses the previous state snapshot (the same
+                object) instead of capturing a new one.
         """
+        self._operator_methods.clear()
+
         # 1. Consolidate streams into a single bytes buffer.
         final_bytes = self._consolidate_streams(streams)
 
         if not final_bytes:
             return
 
-        # 2. Wrap in PDFStream for the parser
+        # 2. Tokenize with the fast tokenizer, if it supports this stream.
+        # Tokenizing up front means we can still fall back before yielding.
+        try:
+            instructions = tokenize(final_bytes)
+        except UnsupportedContent as e:
+            logger.debug("Falling back to pdfminer's parser: %s", e)
+            yield from self._execute_with_parser(final_bytes)
+            return
+
+        passthrough = passthrough & STATELESS_OPERATORS
+        state: Optional[Dict[str, Any]] = None
+        cmd_start_pos = 0
+        for op_name, operands, cmd_end_pos in instructions:
+            if state is not None and op_name in passthrough:
+                step = {
+                    "operator": op_name,
+                    "operands": normalize_pdf_operands(operands),
+                    "state": state,
+                    "raw_bytes": final_bytes[cmd_start_pos:cmd_end_pos],
+                }
+            else:
+                step = self._make_step(
+                    op_name, operands, final_bytes, cmd_start_pos, cmd_end_pos
+                )
+                state = step["state"]
+            yield step
+            cmd_start_pos = cmd_end_pos
+
+    def _execute_with_parser(self, final_bytes: bytes) -> Iterator[Dict[str, Any]]:
+        """Yields step dictionaries, using pdfminer's parser to tokenize."""
+        # 1. Wrap in PDFStream for the parser
         single_stream_obj = PDFStream({}, final_bytes)
 
-        # 3. Instantiate PDFContentParser
+        # 2. Instantiate PDFContentParser
         parser = PDFContentParser([single_stream_obj])
 
         proc_stack: List[Any] = []
@@ -209,7 +308,7 @@ class StreamStateIterator(PDFPageInterpreter):
 
             # Case 1: It is an Operator (Keyword)
             if isinstance(obj, PSKeyword):
-                op_name = obj.name.decode("ascii")
+                op_name = sys.intern(obj.name.decode("ascii"))
                 step_data, cmd_end_pos = self._process_operator(
                     op_name, proc_stack, parser, final_bytes, cmd_start_pos
                 )
@@ -256,13 +355,18 @@ class StreamStateIterator(PDFPageInterpreter):
         """
         # print(f"Before do_Td: {self.textstate}")
         a, b, c, d, e, f = self.textstate.matrix
-
-        textmatrix_np = np.array([[a, b, 0], [c, d, 0], [e, f, 1]])
         g, h = self.textstate.linematrix
-        linematrix_np = textmatrix_np + np.array([[0, 0, 0], [0, 0, 0], [g, h, 0]])
 
-        tm = np.array([[1, 0, 0], [0, 1, 0], [tx, ty, 1]]) @ linematrix_np
-        self.textstate.matrix = tuple(map(float, tm[:, :2].flatten()))
+        # The product, expanded: only the translation row changes, to
+        # tx * (a, b) + ty * (c, d) + T_{lm}'s translation (e + g, f + h)
+        self.textstate.matrix = (
+            float(a),
+            float(b),
+            float(c),
+            float(d),
+            float(tx * a + ty * c + (e + g)),
+            float(tx * b + ty * d + (f + h)),
+        )
 
         # T_{lm} = T_m, so ts.linematrix = (0, 0)
         self.textstate.linematrix = (0, 0)
@@ -294,30 +398,43 @@ class StreamStateIterator(PDFPageInterpreter):
         ts = self.textstate
         if ts.font is None:
             return
-        h_scale = ts.scaling / 100.0
-        tx_accum = 0.0
+        string_width = ts.font.string_width
+        widths = self._string_widths.get(ts.font)
+        if widths is None:
+            widths = self._string_widths[ts.font] = {}
+
+        # Every term is linear, so sum the inputs and scale once at the end
+        kerning = 0.0  # Sum of the numbers
+        glyph_widths = 0.0  # Sum of the string widths (unscaled)
+        chars = 0  # Number of characters
+        spaces = 0  # Number of spaces
 
         for item in seq:
             if isinstance(item, (int, float)):
-                # Kerning: -num / 1000 * fontsize * h_scale
-                tx_accum -= (item / 1000.0) * ts.fontsize * h_scale
+                kerning += item
             elif isinstance(item, (bytes, str)):
-                # 1. Glyph Widths (scaled by font size)
-                w_glyphs = ts.font.string_width(item) * ts.fontsize
-
-                # 2. Character Spacing (Tc)
+                width = widths.get(item)
+                if width is None:
+                    width = widths[item] = string_width(item)
+                glyph_widths += width
                 # Heuristic: 1 byte = 1 char (correct for Type1/TrueType, approx for CID)
-                w_char_spacing = len(item) * ts.charspace
-
-                # 3. Word Spacing (Tw) applied to ASCII spaces (32)
+                chars += len(item)
+                # Word Spacing (Tw) applied to ASCII spaces (32)
                 # Only applies if font is not strictly symbolic/multibyte?
                 # PDF Spec is complex, but checking for byte 32 is the standard heuristic.
-                w_word_spacing = (
-                    item.count(b" " if isinstance(item, bytes) else " ") * ts.wordspace
-                )
+                spaces += item.count(b" " if isinstance(item, bytes) else " ")
 
-                # Sum and apply Horizontal Scaling
-                tx_accum += (w_glyphs + w_char_spacing + w_word_spacing) * h_scale
+        # Sum and apply Horizontal Scaling
+        h_scale = ts.scaling / 100.0
+        tx_accum = h_scale * (
+            # Kerning: -num / 1000 * fontsize
+            -(kerning / 1000.0) * ts.fontsize
+            # Glyph Widths (scaled by font size)
+            + glyph_widths * ts.fontsize
+            # Character Spacing (Tc) and Word Spacing (Tw)
+            + chars * ts.charspace
+            + spaces * ts.wordspace
+        )
 
         self._set_matrices_for_kerning_block(ts, tx_accum)
 
@@ -327,9 +444,11 @@ class StreamStateIterator(PDFPageInterpreter):
         # We advance along the 'a' and 'b' vectors of the text line
         a, b, c, d, e, f = ts.matrix
         # Move e, f by the calculated x-displacement projected onto a, b
-        ts.matrix = (a, b, c, d, e + tx_accum * a, f + tx_accum * b)
+        dx = tx_accum * a
+        dy = tx_accum * b
+        ts.matrix = (a, b, c, d, e + dx, f + dy)
 
         # We want to keep T_{lm} unchanged!!
         # This is what the math gives. Unless I made a mistake...
         g, h = ts.linematrix
-        ts.linematrix = (g - tx_accum * a, h - tx_accum * b)
+        ts.linematrix = (g - dx, h - dy)
@@ -28,7 +28,7 @@ from .utils.pdf_conversion import miner_matrix_to_np
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextState:  # pylint: disable=too-many-instance-attributes
     """Tracks the PDF Text State parameters.
 
@@ -68,13 +68,23 @@ class TextState:  # pylint: disable=too-many-instance-attributes
 
     def copy(self):
         """Return a copy of this state"""
-        new_obj = TextState(**self.__dict__)
-        new_obj.matrix = list(self.matrix)
-        new_obj.line_matrix = list(self.line_matrix)
-        return new_obj
-
-
-@dataclass
+        # Spelled out: much cheaper than a round-trip through a dict
+        return TextState(
+            char_spacing=self.char_spacing,
+            word_spacing=self.word_spacing,
+            horiz_scaling=self.horiz_scaling,
+            leading=self.leading,
+            font_name=self.font_name,
+            fontsize=self.fontsize,
+            render_mode=self.render_mode,
+            rise=self.rise,
+            knockout=self.knockout,
+            matrix=list(self.matrix),
+            line_matrix=list(self.line_matrix),
+        )
+
+
+@dataclass(slots=True)
 class GraphicsState:
     """Tracks the PDF Graphics State parameters.
 
@@ -87,9 +97,7 @@ class GraphicsState:
 
     def copy(self):
         """Return a copy of this state"""
-        new_obj = GraphicsState(**self.__dict__)
-        new_obj.ctm = list(self.ctm)
-        return new_obj
+        return GraphicsState(ctm=list(self.ctm))
 
 
 class StateTracker:
@@ -149,8 +157,8 @@ class StateTracker:
             dst.fontsize = src.fontsize
             dst.render_mode = src.render
             dst.rise = src.rise
-            dst.matrix = src.matrix
-            dst.line_matrix = src.linematrix
+            dst.matrix = list(src.matrix)
+            dst.line_matrix = list(src.linematrix)
 
     def get_snapshot(self) -> Dict[str, Any]:
         """Returns a snapshot of the current state."""
@@ -170,14 +178,9 @@ class StateTracker:
         Returns:
             np.ndarray: A 3-element vector [x, y, 1] representing the cursor position.
         """
-        # Start of text space (0, 0)
-        p = np.array([0.0, 0.0, 1.0])
-
-        # Apply Text Matrix
-        a, b, c, d, e, f = self.textstate.matrix
-        tm = np.array([[a, b, 0], [c, d, 0], [e, f, 1]])
-
-        # Apply CTM
-        ctm = miner_matrix_to_np(self.gstate.ctm)
-
-        return p @ tm @ ctm
+        # The origin (0, 0, 1) times Tm is just Tm's translation (e, f),
+        # so only the CTM needs applying, and scalar arithmetic is much
+        # cheaper than building and multiplying 3x3 arrays.
+        e, f = self.textstate.matrix[4:6]
+        ca, cb, cc, cd, ce, cf = self.gstate.ctm
+        return np.array([e * ca + f * cc + ce, e * cb + f * cd + cf, 1.0])
@@ -0,0 +1,290 @@
+# src/pdfbeaver/tokenizer.py
+#
+# The tokenization rules in this file mirror those of pdfminer.six
+# (https://github.com/pdfminer/pdfminer.six), which is
+# Copyright (c) 2004-2016 Yusuke Shinyama <yusuke at cs dot nyu dot edu>
+# and licensed under the MIT License.
+# ------------------------------------------------------------------------------
+
+"""Module: pdfbeaver.tokenizer
+
+A fast content stream tokenizer.
+
+pdfminer's ``PDFContentParser`` is a character-level state machine
+written in Python, with several method calls per token. This module
+scans a whole (decompressed) content stream with a single compiled
+regular expression instead, and groups the tokens into operators.
+
+The objects produced are exactly those ``PDFContentParser`` would
+produce (``int``, ``float``, ``bool``, ``bytes``, ``PSLiteral``,
+``PSKeyword``, lists and dicts), so the result can be fed to the
+pdfminer state machine unchanged. Anything this tokenizer does not
+reproduce exactly (inline images, malformed structures) raises
+:class:`UnsupportedContent`, and the caller should fall back to
+``PDFContentParser``.
+"""
+
+import re
+import sys
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from pdfminer.psparser import KWD, LIT, literal_name
+from pdfminer.utils import choplist
+
+# One alternative per token type, tried in this order at each position.
+# Whitespace follows pdfminer: ``\s`` plus NUL, which pdfminer skips.
+_TOKEN = re.compile(
+    b"|".join(
+        [
+            rb"(?P<ws>[\s\x00]+)",
+            rb"(?P<comment>%[^\r\n]*)",
+            rb"(?P<number>[-+][0-9]*(?:\.[0-9]*)?|[0-9]+(?:\.[0-9]*)?|\.[0-9]*)",
+            rb"(?P<keyword>[A-Za-z][^#/%\[\]()<>{}\s]*)",
+            rb"(?P<name>/[^/%\[\]()<>{}\s]*)",
+            rb"(?P<dict_begin><<)",
+            rb"(?P<dict_end>>>)",
+            rb"(?P<hexstring><[0-9a-fA-F\s]*)",
+            rb"(?P<string>\()",
+            rb"(?P<gt>>)",
+            rb"(?P<other>.)",
+        ]
+    ),
+    re.DOTALL,
+)
+
+_NAME_HEX = re.compile(rb"#([0-9a-fA-F]{0,2})")
+_SPACE = re.compile(rb"\s")
+_HEX_PAIR = re.compile(rb"[0-9a-fA-F]{2}|.")
+_STRING_SPECIAL = re.compile(rb"[()\\]")
+_OCTAL = re.compile(rb"[0-7]{1,3}")
+
+_ESCAPES = {
+    ord("b"): b"\x08",
+    ord("t"): b"\t",
+    ord("n"): b"\n",
+    ord("f"): b"\x0c",
+    ord("r"): b"\r",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+
+# Structure delimiters, mapped to the pdfminer container type they open/close
+_OPENERS = {b"[": "a", b"{": "p"}
+_CLOSERS = {b"]": "a", b"}": "p"}
+
+# Token types which produce nothing
+_SKIPPED = frozenset(("ws", "comment", "gt"))
+
+# Token types which may be operators
+_KEYWORD_KINDS = frozenset(("keyword", "other"))
+
+# Keywords handled specially by PDFContentParser.do_keyword
+_INLINE_IMAGE_KEYWORDS = frozenset((b"BI", b"ID"))
+
+Instruction = Tuple[str, List[Any], int]
+
+
+class UnsupportedContent(Exception):
+    """Raised when the stream needs the full pdfminer parser."""
+
+
+def tokenize(data: bytes) -> List[Instruction]:
+    """
+    Splits a content stream into ``(operator, operands, end)`` triples.
+
+    ``operator`` is the decoded (and interned) operator name,
+    ``operands`` the list of operands preceding it (as pdfminer objects)
+    and ``end`` the byte offset just past the operator. Operands after
+    the last operator are dropped, as pdfminer does.
+
+    Raises:
+        UnsupportedContent: If the stream contains constructs (such as
+            inline images) that only ``PDFContentParser`` handles.
+    """
+    # pylint: disable=too-many-branches,too-many-statements
+    instructions: List[Instruction] = []
+    # Interned operator names, so that equal operators share one str object
+    op_names: Dict[bytes, str] = {}
+    curstack: List[Any] = []
+    curtype: Optional[str] = None
+    context: List[Tuple[Optional[str], List[Any]]] = []
+
+    match = _TOKEN.match
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        m = match(data, pos)
+        kind = m.lastgroup
+        pos = m.end()
+
+        if kind in _SKIPPED:
+            continue
+
+        token = m.group()
+        if kind == "number":
+            try:
+                value: Any = float(token) if b"." in token else int(token)
+            except ValueError:
+                continue  # e.g. a lone sign; pdfminer drops these
+        elif kind == "name":
+            value = _decode_name(token)
+        elif kind == "hexstring":
+            value = _decode_hex(token[1:])
+        elif kind == "string":
+            value, pos = _read_string(data, pos)
+        elif kind == "dict_begin":
+            context.append((curtype, curstack))
+            curtype, curstack = "d", []
+            continue
+        elif kind == "dict_end":
+            if curtype != "d":
+                continue  # unbalanced; ignored like pdfminer (non-strict)
+            if len(curstack) % 2:
+                raise UnsupportedContent("Invalid dictionary construct")
+            value = {
+                literal_name(k): v for (k, v) in choplist(2, curstack) if v is not None
+            }
+            curtype, curstack = context.pop()
+        elif token in _OPENERS:
+            context.append((curtype, curstack))
+            curtype, curstack = _OPENERS[token], []
+            continue
+        elif token in _CLOSERS:
+            if curtype != _CLOSERS[token]:
+                continue
+            value = curstack
+            curtype, curstack = context.pop()
+        elif token == b"true":
+            value = True
+        elif token == b"false":
+            value = False
+        else:
+            # Keyword: an alphabetic run, or any other single character
+            if token in _INLINE_IMAGE_KEYWORDS or not token.isascii():
+                raise UnsupportedContent(f"Unsupported keyword {token!r}")
+            if curtype is not None:
+                curstack.append(KWD(token))
+                continue
+            name = op_names.get(token)
+            if name is None:
+                name = op_names[token] = sys.intern(token.decode("ascii"))
+            instructions.append((name, curstack, pos))
+            curstack = []
+            continue
+
+        curstack.append(value)
+
+    return instructions
+
+
+def scan_operators(data: bytes) -> FrozenSet[str]:
+    """
+    Returns the names of the operators used in a content stream.
+
+    A cheap relative of :func:`tokenize`, which builds no operands.
+    Keywords nested in arrays or dictionaries are included, so the result
+    may hold a few names that are not operators, but it never misses one.
+
+    Raises:
+        UnsupportedContent: As for :func:`tokenize`.
+    """
+    keywords = set()
+    match = _TOKEN.match
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        m = match(data, pos)
+        kind = m.lastgroup
+        pos = m.end()
+
+        if kind == "string":
+            _, pos = _read_string(data, pos)
+        elif kind in _KEYWORD_KINDS:
+            keywords.add(m.group())
+
+    if not keywords.isdisjoint(_INLINE_IMAGE_KEYWORDS):
+        raise UnsupportedContent("Inline image")
+    try:
+        return frozenset(token.decode("ascii") for token in keywords)
+    except UnicodeDecodeError as e:
+        raise UnsupportedContent("Non-ASCII keyword") from e
+
+
+def _decode_name(token: bytes) -> Any:
+    """Converts ``/Name`` (with optional ``#xx`` escapes) to a PSLiteral."""
+    raw = token[1:]
+    if b"#" in raw:
+        raw = _NAME_HEX.sub(
+            lambda m: bytes((int(m.group(1), 16),)) if m.group(1) else b"", raw
+        )
+    try:
+        name: Any = str(raw, "utf-8")
+    except UnicodeDecodeError:
+        name = raw
+    return LIT(name)
+
+
+def _decode_hex(digits: bytes) -> bytes:
+    """Converts the body of a ``<...>`` hex string to bytes."""
+    digits = _SPACE.sub(b"", digits)
+    if len(digits) % 2 == 0:
+        return bytes.fromhex(digits.decode("ascii"))
+    # pdfminer converts a trailing odd digit on its own (b"4" -> b"\x04")
+    return _HEX_PAIR.sub(lambda m: bytes((int(m.group(0), 16),)), digits)
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[bytes, int]:
+    """
+    Reads a literal string whose opening parenthesis ends at ``pos``.
+
+    Returns the string value and the offset just past the closing
+    parenthesis. Escapes follow pdfminer, which drops unknown escaped
+    characters (and escaped line breaks).
+    """
+    parts: List[bytes] = []
+    depth = 1
+    search = _STRING_SPECIAL.search
+
+    while True:
+        m = search(data, pos)
+        if m is None:
+            raise UnsupportedContent("Unterminated string")
+        start = m.start()
+        parts.append(data[pos:start])
+        char = data[start]
+        pos = start + 1
+
+        if char == 0x28:  # (
+            depth += 1
+            parts.append(b"(")
+        elif char == 0x29:  # )
+            depth -= 1
+            if not depth:
+                return b"".join(parts), pos
+            parts.append(b")")
+        else:  # backslash
+            pos = _read_escape(data, pos, parts)
+
+
+def _read_escape(data: bytes, pos: int, parts: List[bytes]) -> int:
+    """Appends the value of the escape sequence at ``pos``; returns the new offset."""
+    octal = _OCTAL.match(data, pos)
+    if octal:
+        code = int(octal.group(), 8)
+        if code > 255:
+            raise UnsupportedContent("Invalid octal escape")
+        parts.append(bytes((code,)))
+        return octal.end()
+
+    if pos >= len(data):
+        raise UnsupportedContent("Unterminated string")
+
+    char = data[pos]
+    if char in _ESCAPES:
+        parts.append(_ESCAPES[char])
+    elif data[pos : pos + 2] == b"\r\n":
+        pos += 1
+    return pos + 1
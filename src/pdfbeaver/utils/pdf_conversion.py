@@ -2,13 +2,21 @@
 """
 Type conversion helpers for bridging pdfminer, pikepdf, and Python native types.
 """
+import math
 from decimal import Decimal
-from typing import Any, List
+from typing import Any, List, Optional, Sequence
 
 import numpy as np
 import pikepdf
 from pdfminer.psparser import PSKeyword, PSLiteral
 
+# The range of a PDF (qpdf) integer
+_PDF_INT_MIN = -(2**63)
+_PDF_INT_MAX = 2**63 - 1
+
+# Operand types normalize_pdf_operand returns unchanged (exact types)
+_PLAIN_OPERAND_TYPES = frozenset((int, float, bytes))
+
 
 def miner_matrix_to_np(m: List) -> np.ndarray:
     """
@@ -25,18 +33,28 @@ def normalize_pdf_operand(operand: Any) -> Any:
     """
     Converts pdfminer-specific types (PSLiteral) into pikepdf-compatible types.
     """
+    if type(operand) in _PLAIN_OPERAND_TYPES:
+        return operand  # the common case: numbers
     if isinstance(operand, (PSLiteral, PSKeyword)):
         name = operand.name
         if isinstance(name, bytes):
             name = name.decode("ascii")
         return pikepdf.Name(f"/{name}")
-    if isinstance(operand, bytes):
-        return operand
     if isinstance(operand, list):
         return [normalize_pdf_operand(x) for x in operand]
     return operand
 
 
+def normalize_pdf_operands(operands: Sequence[Any]) -> List[Any]:
+    """
+    Applies :func:`normalize_pdf_operand` to each of ``operands``.
+
+    Numbers and strings, most operands, are passed through without a call.
+    """
+    plain = _PLAIN_OPERAND_TYPES
+    return [x if type(x) in plain else normalize_pdf_operand(x) for x in operands]
+
+
 def extract_string_bytes(operand: Any) -> bytes:
     """
     Helper to get raw bytes from various string representations.
@@ -85,3 +103,57 @@ def font_name_to_string(font_obj: Any) -> str:
 
     s = str(font_obj)
     return s.lstrip("/")
+
+
+def unparse_instructions(instructions: Sequence[Any]) -> bytes:
+    """
+    Converts ``(operands, operator)`` instructions to content stream bytes.
+
+    Produces exactly what ``pikepdf.unparse_content_stream`` produces, but
+    instructions whose operands are all plain ``int``/``float`` values
+    (the vast majority, e.g. ``g``, ``re`` or ``Tm``) are formatted
+    directly in Python instead of round-tripping through qpdf objects.
+    Other instructions are handed to pikepdf, in batches.
+    """
+    lines: List[bytes] = []
+    pending: List[Any] = []
+
+    for instruction in instructions:
+        line = _unparse_numeric_instruction(instruction)
+        if line is None:
+            pending.append(instruction)
+            continue
+        if pending:
+            lines.append(pikepdf.unparse_content_stream(pending))
+            pending = []
+        lines.append(line)
+
+    if pending:
+        lines.append(pikepdf.unparse_content_stream(pending))
+
+    return b"\n".join(lines)
+
+
+def _unparse_numeric_instruction(instruction: Any) -> Optional[bytes]:
+    """Formats an instruction with numeric operands, or returns None."""
+    if not isinstance(instruction, tuple) or len(instruction) != 2:
+        return None
+    operands, operator = instruction
+    if not isinstance(operands, (list, tuple)):
+        return None
+
+    parts = []
+    for value in operands:
+        kind = type(value)
+        if kind is float:
+            if not math.isfinite(value):
+                return None  # not valid PDF; pikepdf raises on it
+            # pikepdf writes reals with 6 decimal places, trailing zeros removed
+            parts.append(f"{value:.6f}".rstrip("0").rstrip("."))
+        elif kind is int and _PDF_INT_MIN <= value <= _PDF_INT_MAX:
+            parts.append(str(value))
+        else:
+            return None
+
+    parts.append(str(operator))
+    return " ".join(parts).encode("latin1")
@@ -35,10 +35,10 @@ def extract_text_position(state: Dict[str, Any]) -> np.ndarray:
     # CASE A: CTM is a NumPy Array (3x3)
     # Used by StateTracker
     if isinstance(ctm, np.ndarray) and ctm.shape == (3, 3):
-        # Point vector [x, y, 1]
-        local_point = np.array([tx, ty, 1.0])
-        # Apply transformation: P_new = P_old @ Matrix
-        return local_point @ ctm
+        # Apply transformation: P_new = [x, y, 1] @ Matrix
+        # (in scalars: cheaper than a matrix product for one point)
+        (a, b, u), (c, d, v), (e, f, w) = ctm.tolist()
+        return np.array([tx * a + ty * c + e, tx * b + ty * d + f, tx * u + ty * v + w])
 
     # CASE B: CTM is a List of 6 floats
     # Used by pdfminer / StreamStateIterator
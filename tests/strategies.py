@@ -16,15 +16,13 @@ pdf_name = st.text(
 ).map(lambda x: "/" + x)
 
 # PDF Strings
-pdf_string = st.text(min_size=0, max_size=50).map(lambda x: x.encode("ascii", "ignore"))
+pdf_string = st.binary(min_size=0, max_size=50)
 
 # 2. Operands
 # An operand can be a number, a name, a string, or a list (array)
-# We use a recursive definition for arrays, but keep it shallow for speed
+# Arrays are one level deep (as in TJ and d), which keeps shrinking fast
 basic_operand = st.one_of(pdf_scalar, pdf_name, pdf_string)
-pdf_operand = st.recursive(
-    basic_operand, lambda children: st.lists(children, max_size=5), max_leaves=10
-)
+pdf_operand = st.one_of(basic_operand, st.lists(basic_operand, max_size=5))
 pdf_operands_list = st.lists(pdf_operand, max_size=8)
 
 # 3. Operators
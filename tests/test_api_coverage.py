@@ -1,3 +1,5 @@
+import logging
+import sys
 from decimal import Decimal
 
 import pikepdf
@@ -6,7 +8,13 @@ from pdfminer.pdftypes import PDFStream
 from pdfminer.psparser import PSLiteral
 
 import pdfbeaver as beaver
-from pdfbeaver.api import _convert_to_pdfminer_resources, _resolve_pages
+from pdfbeaver.api import (
+    _convert_to_pdfminer_resources,
+    _handle_invalid_stream_like,
+    _resolve_pages,
+)
+from pdfbeaver.editor import ORIGINAL_BYTES
+from pdfbeaver.optimization import optimize_ops
 
 
 def test_process_argument_validation():
@@ -38,11 +46,15 @@ def test_page_selection_logic(create_pdf):
     assert pages[0].index == 0
     assert pages[1].index == 2
 
-    # 4. Error Case: List with bad type
+    # 4. Select by range
+    pages = _resolve_pages(pdf, range(1, 3))
+    assert [p.index for p in pages] == [1, 2]
+
+    # 5. Error Case: List with bad type
     with pytest.raises(TypeError, match="Invalid item"):
         _resolve_pages(pdf, [0, "not a page"])
 
-    # 5. Error Case: Bad argument type
+    # 6. Error Case: Bad argument type
     with pytest.raises(TypeError, match="Invalid type"):
         _resolve_pages(pdf, "bad argument")
 
@@ -107,11 +119,64 @@ def test_resource_conversion_stream(create_pdf):
     assert converted.attrs["Type"].name == "Metadata"
 
 
+def test_resource_conversion_cache(create_pdf):
+    """Shared indirect objects are converted once; cycles terminate."""
+    pdf = create_pdf(b"")
+
+    font = pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name("/Font")))
+    font.Self = font  # reference cycle
+    resources = pikepdf.Dictionary(
+        Font=pikepdf.Dictionary(F1=font, F2=font),
+    )
+
+    cache = {}
+    converted = _convert_to_pdfminer_resources(resources, cache=cache)
+
+    assert converted["Font"]["F1"] is converted["Font"]["F2"]
+    assert converted["Font"]["F1"]["Self"] is converted["Font"]["F1"]
+    assert list(cache) == [font.objgen]
+
+    # A second conversion reuses the cached object
+    again = _convert_to_pdfminer_resources(resources, cache=cache)
+    assert again["Font"]["F1"] is converted["Font"]["F1"]
+
+    uncached = _convert_to_pdfminer_resources(resources)
+    assert uncached["Font"]["F1"] is uncached["Font"]["F2"]
+    assert uncached["Font"]["F1"]["Self"] is uncached["Font"]["F1"]
+    assert uncached["Font"]["F1"] is not converted["Font"]["F1"]
+
+
+def test_resource_cache_is_scoped_to_one_document(create_pdf):
+    """Options reused across documents never serve another file's resources."""
+    font_names = []
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("Tj")
+    def record_font(context):
+        font_names.append(context.pre_input["font_name"])
+
+    options = beaver.ProcessingOptions()
+    objgens = set()
+    for base_font in ("/Helvetica", "/Courier"):
+        pdf = create_pdf(b"BT /F1 12 Tf (x) Tj ET")
+        font = pdf.make_indirect(
+            pikepdf.Dictionary(
+                Type=pikepdf.Name.Font,
+                Subtype=pikepdf.Name.Type1,
+                BaseFont=pikepdf.Name(base_font),
+            )
+        )
+        objgens.add(font.objgen)
+        pdf.pages[0].Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+        beaver.process(pdf, registry=registry, options=options)
+
+    assert len(objgens) == 1  # the same object number in both documents
+    assert font_names == ["Helvetica", "Courier"]
+
+
 def test_invalid_content_streams_logging(caplog):
     """Test lines 270-276: Handling objects masquerading as streams."""
     # This tests the warning logger
-    import logging
-
     # Create a dict that looks like a stream (has /Contents) but isn't one
     # This hits _handle_invalid_stream_like
     fake_item = pikepdf.Dictionary({"/Contents": []})
@@ -119,7 +184,6 @@ def test_invalid_content_streams_logging(caplog):
     # We can't easily trigger this via public API without mocking internals
     # because pikepdf usually handles the structure before we see it.
     # But we can test the private function directly.
-    from pdfbeaver.api import _handle_invalid_stream_like
 
     # Case 1: Dict with Contents -> Returns contents
     res = _handle_invalid_stream_like(fake_item)
@@ -127,7 +191,105 @@ def test_invalid_content_streams_logging(caplog):
 
     # Case 2: Dict without Contents -> Warning
     bad_item = pikepdf.Dictionary({"/NotContents": 1})
-    with caplog.at_level(logging.WARNING):
+    with caplog.at_level(logging.WARNING, logger="pdfbeaver.api"):
         res = _handle_invalid_stream_like(bad_item)
         assert res == []
-        assert "Skipping invalid content item" in caplog.text
+        assert any(
+            r.name == "pdfbeaver.api"
+            and r.getMessage().startswith("Skipping invalid content item")
+            for r in caplog.records
+        )
+
+
+def test_registry_freeze_is_cached_and_invalidated():
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("Tj")
+    def handle_tj(operands):
+        return []
+
+    table = registry.freeze()
+    assert registry.freeze() is table
+    assert registry.modified_operators == {"Tj"}
+
+    @registry.register("TJ")
+    def handle_tj_array(operands):
+        return []
+
+    assert registry.freeze() is not table
+    assert registry.modified_operators == {"Tj", "TJ"}
+
+
+def test_registry_table_interns_operator_names():
+    registry = beaver.HandlerRegistry()
+    op = "".join(["T", "j"])  # built at runtime, so not interned
+
+    registry.register(op)(lambda: None)
+
+    (key,) = registry.freeze().handlers
+    assert key is sys.intern("Tj")
+
+
+def test_tracker_only_built_when_a_handler_takes_context(create_pdf):
+    built = []
+
+    class RecordingTracker(beaver.StateTracker):
+        def __init__(self):
+            super().__init__()
+            built.append(self)
+
+    options = beaver.ProcessingOptions(tracker_class=RecordingTracker)
+
+    registry = beaver.HandlerRegistry()
+    registry.register("g")(lambda operands: beaver.UNCHANGED)
+    assert not registry.needs_state
+    beaver.process(create_pdf(b"0.5 g"), registry=registry, options=options)
+    assert not built
+
+    @registry.register("Tj")
+    def check_tracker(context):
+        assert context.tracker.textstate.fontsize == 12
+        return beaver.UNCHANGED
+
+    assert registry.needs_state
+    pdf = create_pdf(b"BT /F1 12 Tf (x) Tj ET")
+    beaver.process(pdf, registry=registry, options=options)
+    assert len(built) == 1
+
+
+def test_registry_table_caches_intercepted_operators():
+    registry = beaver.HandlerRegistry()
+    registry.register("Tj")(lambda context: None)
+    table = registry.freeze()
+
+    intercepted = table.intercepted_operators(optimize_ops)
+    assert intercepted == {"Tj"} | optimize_ops.relevant_operators
+    assert table.intercepted_operators(optimize_ops) is intercepted
+    assert table.intercepted_operators(None) == {"Tj"}
+
+    # Replacing the only context-taking handler drops the need for state
+    assert registry.needs_state
+    registry.register("Tj")(lambda operands: None)
+    assert not registry.needs_state
+
+
+def test_register_rejects_unknown_parameters():
+    registry = beaver.HandlerRegistry()
+    with pytest.raises(ValueError, match=r"\['colour', 'size'\] not allowed"):
+        registry.register("Tj")(lambda operands, size, colour: None)
+
+
+def test_registry_normalizes_return_values():
+    normalize = beaver.HandlerRegistry()._normalize_return_value
+    instruction = ([1], "g")
+    listed = [instruction]
+
+    assert normalize(listed) is listed
+    assert normalize(None) == []
+    assert normalize(instruction) == [instruction]
+    assert normalize(b"0 g") == [b"0 g"]
+    assert normalize(ORIGINAL_BYTES) == [ORIGINAL_BYTES]
+    # Any iterator is drained: generators, map, filter, zip, ...
+    assert normalize(x for x in listed) == listed
+    assert normalize(map(tuple, listed)) == listed
+    assert normalize(iter(listed)) == listed
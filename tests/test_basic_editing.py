@@ -1,5 +1,8 @@
 # tests/test_basic_editing.py
 
+import pikepdf
+import pytest
+
 import pdfbeaver as beaver
 
 
@@ -60,6 +63,22 @@ def test_pass_through_unchanged(create_pdf, assert_stream_contains):
     assert_stream_contains(content, "KeepMe", "Tj")
 
 
+def test_pass_through_nested_unchanged(create_pdf, assert_stream_contains):
+    """Test that UNCHANGED inside a list of instructions also keeps the original."""
+    pdf = create_pdf(b"(KeepMe) Tj")
+
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("Tj")
+    def keep_it(operands):
+        return [beaver.UNCHANGED]
+
+    beaver.process(pdf, registry=registry)
+
+    content = pdf.pages[0].Contents.read_bytes()
+    assert_stream_contains(content, "KeepMe", "Tj")
+
+
 def test_insert_multiple_ops(create_pdf, assert_stream_contains):
     """Test replacing 1 operator with 3 (expansion)."""
     pdf = create_pdf(b"(Start) Tj")
@@ -79,3 +98,35 @@ def test_insert_multiple_ops(create_pdf, assert_stream_contains):
     assert b"0.5 g" in content or b".5 g" in content
     assert_stream_contains(content, "Middle", "Tj")
     assert b"0 g" in content
+
+
+def test_empty_registry_without_optimizer_is_untouched(create_pdf):
+    """An empty registry with optimize=False leaves the content stream as-is."""
+    original = b"BT  /F1 12 Tf\n1 0 0 1 10 10   Tm (Hi) Tj ET"
+    pdf = create_pdf(original)
+    contents = pdf.pages[0].Contents
+
+    beaver.process(
+        pdf,
+        registry=beaver.HandlerRegistry(),
+        options=beaver.ProcessingOptions(optimize=False),
+    )
+
+    assert pdf.pages[0].Contents.objgen == contents.objgen
+    assert pdf.pages[0].Contents.read_bytes() == original
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_output_stream_compression(create_pdf, compress):
+    """Modified streams are Flate-compressed, unless compress_streams=False."""
+    pdf = create_pdf(b"(Hello) Tj")
+
+    beaver.process(
+        pdf,
+        registry=beaver.HandlerRegistry(),
+        options=beaver.ProcessingOptions(compress_streams=compress),
+    )
+
+    contents = pdf.pages[0].Contents
+    assert contents.get("/Filter") == (pikepdf.Name.FlateDecode if compress else None)
+    assert contents.read_bytes().strip() == b"(Hello) Tj"
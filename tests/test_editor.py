@@ -3,7 +3,12 @@ from pdfminer.pdftypes import PDFStream
 from pikepdf import Operator
 
 # We need to access private methods to test normalization directly
-from pdfbeaver.editor import ORIGINAL_BYTES, StreamEditor, _Sentinel
+from pdfbeaver.editor import (
+    ORIGINAL_BYTES,
+    StreamEditor,
+    _operands_are_safe,
+    _Sentinel,
+)
 
 
 # Mock objects to instantiate Editor
@@ -50,6 +55,14 @@ def test_normalize_instruction_tuple_errors(editor):
         editor._normalize_instruction((1, 2, 3))
 
 
+def test_normalize_instruction_shares_operators(editor):
+    (_, first), (_, second) = (
+        editor._normalize_instruction("Tj"),
+        editor._normalize_instruction(([b"x"], "Tj")),
+    )
+    assert first is second
+
+
 def test_repr(editor):
     """Test __repr__ (Lines 195-217)."""
     # Just ensure it doesn't crash and returns a string
@@ -58,20 +71,54 @@ def test_repr(editor):
     assert "handler=" in s
 
 
-def test_safety_checks_huge_int(editor):
-    """Test _is_safe_to_optimize defensive checks (Line 302-307)."""
+def test_safety_checks_huge_int():
+    """Test _operands_are_safe defensive checks."""
     # Huge integer that exceeds PDF limits
     huge_int = 1152921504606846977  # 2^60 + 1
 
-    safe = editor._is_safe_to_optimize("Tm", [huge_int], {"Tm"})
+    safe = _operands_are_safe([huge_int])
     assert safe is False
 
 
-def test_safety_checks_stream_object(editor):
-    """Test _is_safe_to_optimize defensive checks (Line 308-309)."""
+def test_safety_checks_stream_object():
+    """Test _operands_are_safe defensive checks."""
     # Stream objects inside content streams are illegal/malformed
     # We mock PDFStream (it requires dict and data)
     mock_stream = PDFStream({}, b"")
 
-    safe = editor._is_safe_to_optimize("Tm", [mock_stream], {"Tm"})
+    safe = _operands_are_safe([mock_stream])
     assert safe is False
+
+
+def test_unsafe_operands_bypass_the_handler():
+    """Operators with unsafe operands are copied through, not intercepted."""
+
+    class DeletingHandler(MockHandler):
+        modified_operators = {"Tz"}
+
+    steps = [
+        {
+            "operator": "Tz",
+            "operands": [2**60 + 1],
+            "raw_bytes": b"1152921504606846977 Tz",
+            "state": {},
+        },
+        {"operator": "Tz", "operands": [50], "raw_bytes": b"50 Tz", "state": {}},
+    ]
+    editor = StreamEditor(iter(steps), DeletingHandler(), tracker=None)
+
+    assert editor.process().strip() == b"1152921504606846977 Tz"
+
+
+def test_current_position_follows_last_state():
+    tstate = type("MockTState", (), {"matrix": [1, 0, 0, 1, 5.0, 6.0]})()
+    state = {"tstate": tstate, "ctm": (1, 0, 0, 1, 10, 20)}
+    steps = [
+        {"operator": "Td", "operands": [], "state": state, "raw_bytes": b"5 6 Td"},
+        {"operator": "n", "operands": [], "state": None, "raw_bytes": b"n"},
+    ]
+    editor = StreamEditor(source_iterator=steps, handler=MockHandler(), tracker=None)
+    assert list(editor.current_position) == [0.0, 0.0, 1.0]
+
+    editor.process()
+    assert list(editor.current_position) == [15.0, 26.0, 1.0]
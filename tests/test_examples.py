@@ -2,9 +2,12 @@ import sys
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
 import pikepdf
 import pytest
 
+import pdfbeaver as beaver
+
 # Setup path to import examples
 EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
 sys.path.append(str(EXAMPLES_DIR))
@@ -12,6 +15,7 @@ sys.path.append(str(EXAMPLES_DIR))
 import dark_mode
 import redactor
 import trivial
+import vector_optimizer
 
 
 @pytest.fixture
@@ -47,6 +51,7 @@ def test_dark_mode_main(input_pdf_path, tmp_path):
     # Check if content actually changed (background added)
     content = _get_first_page_content(output)
     assert b"re" in content  # Rectangle added
+    assert b"1 1 1 rg" in content  # Black text inverted to white
 
 
 def test_redactor_main(input_pdf_path, tmp_path):
@@ -65,6 +70,51 @@ def test_redactor_main(input_pdf_path, tmp_path):
     assert b"re" in content  # Black box added
 
 
+def test_redactor_unparse_rects_bulk():
+    rects = np.array([[1, 2, 3, 4], [0.5, -0.0, 10.25, 1 / 3]])
+    expected = b"1 2 3 4 re\n0.5 -0 10.25 0.333333 re\n"
+    assert redactor._unparse_rects_bulk(rects) == expected
+    # Same precision as unparsing the operators one by one
+    ops = [(row, pikepdf.Operator("re")) for row in rects.tolist()]
+    assert expected == pikepdf.unparse_content_stream(ops) + b"\n"
+    assert redactor._unparse_rects_bulk(rects[:0]) == b""
+
+
+def test_vector_optimizer_simplify_path():
+    # Collinear interior points are dropped, the corner is kept
+    points = [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3)]
+    simplified = vector_optimizer.simplify_path(points, epsilon=0.1)
+    assert simplified.tolist() == [[0, 0], [3, 0], [3, 3]]
+
+    # Short paths are returned unchanged
+    assert vector_optimizer.simplify_path([(0, 0), (5, 5)], 1.0).tolist() == [
+        [0, 0],
+        [5, 5],
+    ]
+
+
+def test_vector_optimizer_kernel_matches_numpy(monkeypatch):
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(size=(200, 2)), axis=0)
+
+    # Force the NumPy implementation for the reference result
+    monkeypatch.setattr(vector_optimizer, "_rdp_njit", None)
+    expected = vector_optimizer.simplify_path(points, epsilon=1.5)
+
+    keep = vector_optimizer._rdp_kernel(points[:, 0].copy(), points[:, 1].copy(), 1.5)
+    assert np.array_equal(points[keep], expected)
+
+
+def test_vector_optimizer_process(create_pdf):
+    pdf = create_pdf(b"0 0 m 1 0.01 l 2 0 l 3 0.01 l 4 0 l S")
+    optimizer = vector_optimizer.VectorOptimizer(epsilon=0.5)
+    beaver.process(pdf, registry=optimizer.registry)
+
+    content = pdf.pages[0].Contents.read_bytes()
+    assert content.count(b" l") == 1
+    assert b"S" in content
+
+
 def _get_first_page_content(filename):
     pdf = pikepdf.open(filename)
     page = pdf.pages[0]
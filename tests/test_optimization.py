@@ -19,8 +19,9 @@ def optimize_assertion(create_pdf, original_stream, expected_stream):
     assert wsfix(content) == wsfix(expected_stream)
 
 
-def test_optimize_various(create_pdf):
-    pairs = {
+@pytest.mark.parametrize(
+    "original,expected",
+    [
         (b"1 0 0 1 100 100 Tm 1 0 0 1 100 90 Tm (B) Tj", b"1 0 0 1 100 90 Tm (B) Tj"),
         (
             b"1 0 0 1 100 100 Tm (A) Tj 1 0 0 1 100 90 Tm (B) Tj",
@@ -38,9 +39,10 @@ def test_optimize_various(create_pdf):
             b"1 0 0 1 100 90 Tm 10 5 Td 1 2 3 4 5 6 Tm 25 50 Td (B) Tj",
             b"1 2 3 4 5 6 Tm 25 50 Td (B) Tj",
         ),
-    }
-    for x, y in pairs:
-        optimize_assertion(create_pdf, x, y)
+    ],
+)
+def test_optimize_various(create_pdf, original, expected):
+    optimize_assertion(create_pdf, original, expected)
 
 
 def test_optimize_combine_arithmetic(create_pdf):
@@ -139,3 +141,26 @@ def test_handle_td_errors():
     result = optimize_ops(ops)
     assert len(result) == 2
     assert result[1][1] == "Td"
+
+
+def test_optimize_dead_store_then_redundancy():
+    """Redundancy is judged against the stores that survive dead-store removal."""
+    ops = [
+        ([50], "Tz"),  # Dead: overwritten before use
+        ([100], "Tz"),  # Then redundant: 100 is the default
+        ([1, 0, 0, 1, 0, 0], "Tm"),  # Dead
+        ([5, 5], "Td"),  # Dead
+        ([1, 0, 0, 1, 9, 9], "Tm"),
+        (["Text"], "Tj"),
+        ([2, 2], "Td"),  # Kept: nothing overwrites it
+    ]
+    result = optimize_ops(ops)
+    assert result == [([1, 0, 0, 1, 9, 9], "Tm"), (["Text"], "Tj"), ([2, 2], "Td")]
+
+
+def test_optimize_without_stores_returns_copy():
+    """Streams without Tm/Td/Tz/Tf skip the pass and come back unchanged."""
+    ops = [([], "q"), ([1, 0, 0, 1, 5, 5], "cm"), ([], "BT"), ([], "ET"), ([], "Q")]
+    result = optimize_ops(ops)
+    assert result == ops
+    assert result is not ops
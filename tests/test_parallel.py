@@ -0,0 +1,47 @@
+import pikepdf
+import pytest
+
+import pdfbeaver as beaver
+
+pytest.importorskip("cloudpickle")
+
+
+def _make_pdf(num_pages):
+    pdf = pikepdf.new()
+    for i in range(num_pages):
+        page = pdf.add_blank_page(page_size=(100, 100))
+        page.Contents = pdf.make_stream(b"BT /F1 12 Tf (Page %d) Tj ET 0.5 g" % i)
+
+    form = pdf.make_stream(b"(Form) Tj")
+    form.Type = pikepdf.Name.XObject
+    form.Subtype = pikepdf.Name.Form
+    form.BBox = [0, 0, 100, 100]
+    pdf.pages[0].Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Form1=form))
+    return pdf
+
+
+def _process(workers):
+    pdf = _make_pdf(4)
+    registry = beaver.HandlerRegistry()
+    replacement = "Hidden"  # captured by the closure below
+
+    @registry.register("Tj")
+    def redact(operands, context):
+        return [([replacement], "Tj")]
+
+    beaver.process(
+        pdf, registry=registry, options=beaver.ProcessingOptions(workers=workers)
+    )
+    return pdf
+
+
+def test_workers_match_sequential_processing():
+    sequential = _process(workers=1)
+    parallel = _process(workers=2)
+
+    for expected, actual in zip(sequential.pages, parallel.pages):
+        assert actual.Contents.read_bytes() == expected.Contents.read_bytes()
+        assert b"Hidden" in actual.Contents.read_bytes()
+
+    form = parallel.pages[0].Resources.XObject.Form1
+    assert b"Hidden" in form.read_bytes()
@@ -1,6 +1,9 @@
 # tests/test_pdf_conversion.py
+from decimal import Decimal
+
 import numpy as np
 import pikepdf
+import pytest
 from pdfminer.psparser import PSKeyword, PSLiteral
 
 from pdfbeaver.utils.pdf_conversion import (
@@ -8,6 +11,8 @@ from pdfbeaver.utils.pdf_conversion import (
     font_name_to_string,
     miner_matrix_to_np,
     normalize_pdf_operand,
+    normalize_pdf_operands,
+    unparse_instructions,
 )
 
 
@@ -51,6 +56,13 @@ def test_recurse_lists():
     assert str(result[1]) == "/A"
 
 
+def test_normalize_operands_matches_single():
+    operands = [1, 2.5, b"(x)", PSLiteral("F1"), [PSKeyword(b"K"), 3], True, None]
+    assert normalize_pdf_operands(operands) == [
+        normalize_pdf_operand(x) for x in operands
+    ]
+
+
 def test_passthrough_pikepdf_objects():
     """Verify that objects already in pikepdf format are left alone."""
 
@@ -139,3 +151,27 @@ def test_extract_bytes_fallback_objects():
     # An object that cannot be converted to bytes
     obj = object()
     assert extract_string_bytes(obj) is obj
+
+
+@pytest.mark.parametrize(
+    "instructions",
+    [
+        [([0.5], "g"), ([0, 0, 10.25, 1 / 3], pikepdf.Operator("re")), ([], "f")],
+        [([-0.0, 1e-7, 1e20, 2**63 - 1], "Tm")],
+        [([pikepdf.Name.F1, 12], "Tf"), ([1, 2], "Td"), ([b"(x)"], "Tj")],
+        [([2**63], "g")],  # out of range: pikepdf's error is kept
+        [([True], "g"), ([Decimal("0.50")], "g")],
+        # not finite: pikepdf's errors are kept
+        [([0.5], "g"), ([float("nan")], "g")],
+        [([float("inf"), 0, 0], "rg")],
+        [([1, 0, 0, 1, float("-inf"), 0], "Tm")],
+    ],
+)
+def test_unparse_instructions_matches_pikepdf(instructions):
+    try:
+        expected = pikepdf.unparse_content_stream(instructions)
+    except (OverflowError, pikepdf.PdfError) as e:
+        with pytest.raises(type(e)):
+            unparse_instructions(instructions)
+    else:
+        assert unparse_instructions(instructions) == expected
@@ -23,6 +23,14 @@ def test_geometry_numpy_ctm():
     assert np.allclose(pos, [10.0, 20.0, 1.0])
 
 
+def test_geometry_numpy_ctm_matches_matrix_product():
+    ctm = np.array([[0.0, 1.5, 0.0], [-2.0, 0.5, 0.0], [7.0, 11.0, 1.0]])
+    tstate = type("MockTState", (), {"matrix": [2, 0, 0, 2, 3.0, -4.0]})()
+
+    pos = extract_text_position({"tstate": tstate, "ctm": ctm})
+    assert np.allclose(pos, np.array([3.0, -4.0, 1.0]) @ ctm)
+
+
 def test_geometry_tstate_variations():
     """Test lines 22-25: tstate as dict or missing matrix."""
 
@@ -1,5 +1,6 @@
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 from pdfminer.pdfdevice import PDFDevice
 from pdfminer.pdfinterp import PDFContentParser, PDFResourceManager
@@ -55,6 +56,12 @@ def test_consolidate_various_types(iterator):
     assert result == b"A B C"
 
 
+def test_consolidate_single_bytes_is_not_copied(iterator):
+    data = b"q 1 0 0 1 0 0 cm Q" * 100
+    assert iterator._consolidate_streams([data]) is data
+    assert iterator._consolidate_streams([b" q Q\n"]) == b"q Q"
+
+
 # --- 2. Parser robustness ---
 
 
@@ -137,6 +144,21 @@ def test_do_TD_logic(iterator):
     assert iterator.textstate.matrix[5] == 20
 
 
+def test_do_Td_matches_matrix_product(iterator):
+    """Td sets T_m = T_lm = [1 0 0; 0 1 0; tx ty 1] @ T_lm."""
+    a, b, c, d, e, f = 2.0, 0.5, -0.25, 3.0, 10.0, -20.0
+    g, h = 4.0, -6.0  # T_lm's offset from T_m
+    iterator.textstate.matrix = (a, b, c, d, e, f)
+    iterator.textstate.linematrix = (g, h)
+
+    iterator.do_Td(7, -3)
+
+    line_matrix = np.array([[a, b, 0], [c, d, 0], [e + g, f + h, 1]])
+    expected = np.array([[1, 0, 0], [0, 1, 0], [7, -3, 1]]) @ line_matrix
+    assert np.allclose(iterator.textstate.matrix, expected[:, :2].flatten())
+    assert tuple(iterator.textstate.linematrix) == (0, 0)
+
+
 def test_do_TJ_numeric_kerning(iterator):
     """Test line 306: TJ with numeric arguments (kerning)."""
     # Setup state
@@ -163,6 +185,23 @@ def test_do_TJ_numeric_kerning(iterator):
     assert iterator.textstate.matrix[4] == -5.0
 
 
+def test_do_TJ_caches_string_widths(iterator):
+    """Each string's width is computed once per font."""
+    iterator.textstate.fontsize = 1
+    iterator.textstate.scaling = 100
+    iterator.textstate.matrix = (1, 0, 0, 1, 0, 0)
+    iterator.textstate.linematrix = (0, 0)
+    font = Mock()
+    font.string_width.side_effect = len
+    iterator.textstate.font = font
+
+    iterator.do_TJ([b"ab", b"c", b"ab"])
+    iterator.do_TJ([b"ab"])
+
+    assert font.string_width.call_count == 2
+    assert iterator.textstate.matrix[4] == 7
+
+
 def test_consolidate_indirect_cycle(iterator):
     """Test robustness against indirect loops (A -> B -> A)."""
 
@@ -196,3 +235,32 @@ def test_consolidate_indirect_cycle(iterator):
 
     # It should break the loop safely and extract data from the last visited node (A)
     assert result == b"A"
+
+
+# --- 4. Pass-through operators ---
+
+
+def test_passthrough_reuses_state(iterator, mocker):
+    """Pass-through operators are not executed and share the previous snapshot."""
+    spy = mocker.spy(iterator, "do_re")
+    steps = list(
+        iterator.execute(
+            [b"1 0 0 1 5 5 cm 0 0 10 10 re f 2 w"], passthrough={"re", "f"}
+        )
+    )
+
+    assert [s["operator"] for s in steps] == ["cm", "re", "f", "w"]
+    assert steps[1]["state"] is steps[0]["state"]
+    assert steps[2]["state"] is steps[0]["state"]
+    assert steps[3]["state"] is not steps[0]["state"]
+    assert steps[1]["operands"] == [0, 0, 10, 10]
+    assert steps[1]["raw_bytes"] == b" 0 0 10 10 re"
+    spy.assert_not_called()
+
+
+def test_passthrough_ignores_stateful_operators(iterator):
+    """Only operators in STATELESS_OPERATORS can be passed through."""
+    steps = list(
+        iterator.execute([b"1 0 0 1 5 5 cm 2 0 0 2 0 0 cm"], passthrough={"cm"})
+    )
+    assert steps[1]["state"]["ctm"] == (2, 0, 0, 2, 5, 5)
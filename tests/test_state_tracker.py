@@ -1,3 +1,5 @@
+import dataclasses
+
 import numpy as np
 
 from pdfbeaver.state_tracker import StateTracker
@@ -42,3 +44,27 @@ def test_get_current_user_pos_with_rotation():
 
     pos = tracker.get_current_user_pos()
     assert np.allclose(pos, [100.0, 100.0, 1.0])
+
+
+def test_get_current_user_pos_matches_matrix_product():
+    tracker = StateTracker()
+    tracker.textstate.matrix = [2.0, 0.5, -0.25, 3.0, 10.0, -20.0]
+    tracker.gstate.ctm = [0.0, 1.5, -2.0, 0.5, 7.0, 11.0]
+
+    _, trm = tracker.get_matrices()
+    assert np.allclose(tracker.get_current_user_pos(), trm[2])
+
+
+def test_text_state_copy_is_independent():
+    tracker = StateTracker()
+    tracker.textstate.fontsize = 12.0
+    tracker.textstate.font_name = "Helvetica"
+
+    snapshot = tracker.get_snapshot()
+    tracker.textstate.matrix[4] = 99.0
+    tracker.gstate.ctm[5] = 99.0
+
+    assert snapshot["tstate"] == dataclasses.replace(
+        tracker.textstate, matrix=[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    )
+    assert snapshot["gstate"].ctm == [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
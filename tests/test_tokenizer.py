@@ -0,0 +1,141 @@
+import sys
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from pdfminer.pdfdevice import PDFDevice
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.psparser import KWD, PSLiteral
+
+from pdfbeaver.state_iterator import StreamStateIterator
+from pdfbeaver.tokenizer import UnsupportedContent, scan_operators, tokenize
+
+
+def _make_iterator():
+    rsrcmgr = PDFResourceManager()
+    return StreamStateIterator(rsrcmgr, PDFDevice(rsrcmgr))
+
+
+def _summarize(steps):
+    return [
+        (s["operator"], repr(s["operands"]), s["raw_bytes"], s["state"]["ctm"])
+        for s in steps
+    ]
+
+
+def _assert_matches_pdfminer(data: bytes):
+    """The fast path must yield exactly what pdfminer's parser yields."""
+    data = _make_iterator()._consolidate_streams([data])
+    try:
+        expected = _summarize(_make_iterator()._execute_with_parser(data))
+    except Exception as e:  # pylint: disable=broad-except
+        expected = type(e)
+    try:
+        actual = _summarize(_make_iterator().execute([data]))
+    except Exception as e:  # pylint: disable=broad-except
+        actual = type(e)
+
+    # pdfminer's positions lose the raw bytes of a lone operator at offset 0
+    if isinstance(expected, list) and len(expected) == 1 and not expected[0][2]:
+        expected[0] = expected[0][:2] + (data,) + expected[0][3:]
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"BT /F1 12 Tf 1 0 0 1 10 10 Tm (Hello \\(World\\)) Tj ET",
+        b"q 1 0 0 1 50 50 cm 0 0 m 10 10 l S Q",
+        b"[(A) -120 (B) 5.5 (C)] TJ 0 g",
+        b"/Span <</MCID 0 /Alt (x)>> BDC EMC",
+        b"<48656c6c6f> Tj <4 8 6> Tj",
+        b"(a\\101b\\1234\\q\\\nc\\\r\nd) Tj",
+        b"(nested (parens) ok) Tj",
+        b"1.5.3 -.5 +5 - . 5. Td",
+        b"/A#20B /C# /D#4G /E#41#42 cs",
+        b"10 10 Td T* (x) ' 1 2 (y) \" ",
+        b"% comment\n1 g %another\r0 G",
+        b"]q [1 2 [3 4] 5] d0 } Q",
+        b"true false null xyz",
+        b"0.5 g 1 0 0 RG 12Tf",
+        b"{ 1 2 add } exec",
+        b"5 w\x00 10 J",
+    ],
+)
+def test_matches_pdfminer(data):
+    _assert_matches_pdfminer(data)
+
+
+# Bytes drawn from the characters that matter to the tokenizer
+pdf_soup = st.lists(st.sampled_from(list(b" \n()<>[]{}/%#\\.-+019TfjqBI")), max_size=40)
+
+
+@settings(max_examples=300, deadline=None)
+@given(pdf_soup.map(bytes))
+def test_fuzz_matches_pdfminer(data):
+    _assert_matches_pdfminer(data)
+
+
+@settings(max_examples=300, deadline=None)
+@given(pdf_soup.map(bytes))
+def test_fuzz_scan_operators_finds_every_operator(data):
+    try:
+        operators = {op for op, _, _ in tokenize(data)}
+    except UnsupportedContent:
+        return
+    assert operators <= scan_operators(data)
+
+
+def test_scan_operators():
+    assert scan_operators(b"q 0 0 m (Tj) Tj [(a) 1] TJ Q") >= {
+        "q",
+        "m",
+        "Tj",
+        "TJ",
+        "Q",
+    }
+    with pytest.raises(UnsupportedContent):
+        scan_operators(b"BI /W 1 ID x EI")
+
+
+def test_tokenize_structure():
+    instructions = tokenize(b"/F1 12 Tf [(A) -5] TJ")
+
+    assert [(op, end) for op, _, end in instructions] == [("Tf", 9), ("TJ", 21)]
+    name, size = instructions[0][1]
+    assert isinstance(name, PSLiteral) and name.name == "F1"
+    assert size == 12
+    assert instructions[1][1] == [[b"A", -5]]
+
+
+def test_tokenize_nested_keyword_stays_operand():
+    ((op, operands, _),) = tokenize(b"[1 foo] d")
+    assert op == "d"
+    assert operands == [[1, KWD(b"foo")]]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"BI /W 1 /H 1 ID \x00\x01 EI",  # inline image
+        b"(unterminated Tj",
+        b"<</A>> BDC",  # odd dictionary
+        b"(\\777) Tj",  # octal escape out of range
+    ],
+)
+def test_tokenize_unsupported(data):
+    with pytest.raises(UnsupportedContent):
+        tokenize(data)
+
+
+def test_execute_falls_back_for_inline_images():
+    steps = list(
+        _make_iterator().execute([b"q BI /W 1 /H 1 /BPC 8 /CS /G ID \x00 EI Q"])
+    )
+    assert [s["operator"] for s in steps] == ["q", "EI", "Q"]
+
+
+def test_tokenize_interns_operator_names():
+    first, second = tokenize(b"0 g 1 g")
+    assert first[0] is second[0] is sys.intern("g")
@@ -1,3 +1,5 @@
+import sys
+
 import pikepdf
 
 import pdfbeaver as beaver
@@ -63,3 +65,113 @@ def test_disable_recursion(create_pdf, assert_stream_contains):
     xobj_content = xobj.read_bytes()
     assert b"(Hidden) Tj" in xobj_content
     assert b"Found" not in xobj_content
+
+
+def _make_shared_xobject_pdf(create_pdf):
+    """Two pages sharing one indirect /Resources with a Form XObject."""
+    pdf = create_pdf(b"/Form1 Do")
+    xobj = pdf.make_stream(b"0.25 g")
+    xobj.Type = pikepdf.Name("/XObject")
+    xobj.Subtype = pikepdf.Name("/Form")
+    xobj.BBox = [0, 0, 100, 100]
+
+    resources = pdf.make_indirect(
+        pikepdf.Dictionary(XObject=pikepdf.Dictionary(Form1=xobj))
+    )
+    pdf.pages[0].Resources = resources
+    pdf.add_blank_page(page_size=(100, 100))
+    pdf.pages[1].Contents = pdf.make_stream(b"/Form1 Do")
+    pdf.pages[1].Resources = resources
+
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("g")
+    def invert(operands):
+        return ([1 - float(operands[0])], "g")
+
+    return pdf, resources, xobj, registry
+
+
+def test_shared_xobject_modified_once_across_pages(create_pdf):
+    """A Form XObject shared by several pages is only edited once per process()."""
+    pdf, _, xobj, registry = _make_shared_xobject_pdf(create_pdf)
+
+    # Without explicit options
+    beaver.process(pdf, registry=registry)
+
+    # Inverted exactly once (a second pass would restore 0.25)
+    assert b"0.75" in xobj.read_bytes()
+
+
+def test_shared_resources_are_cached(create_pdf):
+    """Shared resources are converted once, and kept in the options' cache."""
+    pdf, resources, xobj, registry = _make_shared_xobject_pdf(create_pdf)
+
+    options = beaver.ProcessingOptions()
+    beaver.process(pdf, registry=registry, options=options)
+
+    assert b"0.75" in xobj.read_bytes()
+    # The shared resource dictionary and XObject were converted and cached
+    assert resources.objgen in options.resource_cache
+    assert xobj.objgen in options.resource_cache
+
+
+def test_xobject_without_intercepted_operators_is_untouched(create_pdf):
+    """A Form XObject using none of the intercepted operators is not rewritten."""
+    pdf = create_pdf(b"/Logo Do /Label Do")
+    page = pdf.pages[0]
+
+    def make_form(content):
+        form = pdf.make_stream(content)
+        form.Type = pikepdf.Name("/XObject")
+        form.Subtype = pikepdf.Name("/Form")
+        form.BBox = [0, 0, 100, 100]
+        return form
+
+    logo = make_form(b"0 0 m 10 10 l S")
+    label = make_form(b"BT (Hidden) Tj ET")
+    page.Resources = pikepdf.Dictionary(
+        XObject=pikepdf.Dictionary(Logo=logo, Label=label)
+    )
+    logo_data = logo.read_raw_bytes()
+
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("Tj")
+    def redact(operands):
+        return [("Found", "Tj")]
+
+    beaver.process(pdf, registry=registry)
+
+    assert logo.read_raw_bytes() == logo_data
+    assert b"Found" in label.read_bytes()
+
+
+def test_deeply_nested_xobjects(create_pdf):
+    """Nesting deeper than Python's recursion limit is still walked."""
+    pdf = create_pdf(b"/Fm Do")
+
+    def make_form(content, child=None):
+        form = pdf.make_stream(content)
+        form.Type = pikepdf.Name("/XObject")
+        form.Subtype = pikepdf.Name("/Form")
+        form.BBox = [0, 0, 100, 100]
+        if child is not None:
+            form.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm=child))
+        return form
+
+    innermost = make_form(b"(Hidden) Tj")
+    form = innermost
+    for _ in range(sys.getrecursionlimit() + 100):
+        form = make_form(b"/Fm Do", form)
+    pdf.pages[0].Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm=form))
+
+    registry = beaver.HandlerRegistry()
+
+    @registry.register("Tj")
+    def redact(operands):
+        return [("Found", "Tj")]
+
+    beaver.process(pdf, registry=registry)
+
+    assert b"Found" in innermost.read_bytes()